@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Benchmark the integrity gate on synthetic release sets of growing size.
+
+Each scale generates canonical, records, web and machine trees for
+8 x scale standards: PDFs written with pypdf, a matching integrity baseline,
+registry JSON and a registry.ts. It then times verify_release.py end to end
+and per phase and records its peak RSS, the larger of the gate process and
+its PDF parsing workers. With --compare, a scale that is slower or larger
+than a saved result by more than --threshold fails the run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from pypdf import PdfWriter
+from pypdf.generic import DecodedStreamObject, DictionaryObject, NameObject
+
+from verify_release import load_json, positive_int, sha256_bytes
+
+GATE = Path(__file__).with_name("verify_release.py")
+BASE_STANDARDS = 8  # the size of today's release set
+VERSION = "v1.0-F"
+WORDS = "verification authority delegation registry artifact conformance record digest frozen normative".split()
+
+
+def pdf_bytes(canonical_id: str, title: str, pages: int, page_kb: int, seed: int) -> bytes:
+    """A text PDF whose first page carries the identity text the gate looks for."""
+    words = random.Random(seed)
+    writer = PdfWriter()
+    font = DictionaryObject(
+        {
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        }
+    )
+    for index in range(pages):
+        lines = [f"{canonical_id} {title}", f"Page {index + 1} of {pages}"] if index == 0 else [f"Page {index + 1}"]
+        while sum(len(line) + 6 for line in lines) < page_kb * 1024:
+            lines.append(" ".join(words.choice(WORDS) for _ in range(12)))
+        text = " T* ".join(f"({line}) Tj" for line in lines)
+        stream = DecodedStreamObject()
+        stream.set_data(f"BT /F1 8 Tf 36 756 Td 9 TL {text} ET".encode("latin-1"))
+        page = writer.add_blank_page(612, 792)
+        page[NameObject("/Resources")] = DictionaryObject({NameObject("/Font"): DictionaryObject({NameObject("/F1"): font})})
+        page.replace_contents(stream)
+    output = tempfile.SpooledTemporaryFile()
+    writer.write(output)
+    output.seek(0)
+    return output.read()
+
+
+def place(source: Path, target: Path) -> None:
+    # Hard links keep 1000x trees small on disk; the gate still hashes each path.
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        target.write_bytes(source.read_bytes())
+
+
+def generate(root: Path, count: int, pages: int, page_kb: int) -> None:
+    canonical, records, web, machine = root / "canonical", root / "records", root / "web", root / "machine"
+    for directory in (canonical / "integrity", canonical / "registry", canonical / "signatures", records, web / "lib", machine / "registry"):
+        directory.mkdir(parents=True, exist_ok=True)
+    baseline, registry, mirror, blocks = [], [], [], []
+    for index in range(count):
+        canonical_id = f"RM-S-BENCH-{index + 1:05d}"
+        title = f"Synthetic Benchmark Standard {index + 1}"
+        record_filename = f"{canonical_id.lower()}-record.pdf"
+        data = pdf_bytes(canonical_id, title, pages, page_kb, index)
+        digest = sha256_bytes(data)
+        (records / record_filename).write_bytes(data)
+        place(records / record_filename, records / f"{canonical_id}.pdf")
+        place(records / record_filename, canonical / "documents" / f"{canonical_id}.pdf")
+        place(records / record_filename, machine / "artifacts" / f"{canonical_id}.pdf")
+        (canonical / "signatures" / f"{canonical_id}.sig").write_text(f"signed sha256:{digest}\n", encoding="utf-8")
+        url = f"https://records.rulemark.org/{record_filename}"
+        baseline.append(
+            {
+                "canonical_id": canonical_id,
+                "version": VERSION,
+                "status": "FROZEN",
+                "title": title,
+                "citation": f"{canonical_id} {VERSION}",
+                "sha256": digest,
+                "bytes": len(data),
+                "pages": pages,
+                "record_filename": record_filename,
+                "canonical_alias_filename": f"{canonical_id}.pdf",
+                "canonical_document": f"documents/{canonical_id}.pdf",
+                "signature": f"signatures/{canonical_id}.sig",
+                "canonical_file_url": url,
+                "registry_issued_at": "2026-07-23",
+                "pdf_identity": {"mode": "canonical_id_and_title", "required_text": [title]},
+            }
+        )
+        registry.append(
+            {"canonical_id": canonical_id, "version": VERSION, "status": "FROZEN", "title": title, "locations": {"canonical_file": url}}
+        )
+        mirror.append({"canonical_id": canonical_id, "version": VERSION, "status": "FROZEN"})
+        blocks.append(
+            f"""  {{
+    canonical_id: "{canonical_id}",
+    version: "{VERSION}",
+    title: "{title}",
+    sha256: "{digest}",
+    bytes: {len(data)},
+    record: "/records/{record_filename}",
+    citation: "{canonical_id} {VERSION}",
+    issued_at: "2026-07-23",
+  }},"""
+        )
+    (canonical / "integrity" / "standards.json").write_text(json.dumps({"standards": baseline}, indent=2), encoding="utf-8")
+    (canonical / "registry" / "standards.json").write_text(json.dumps({"standards": registry}, indent=2), encoding="utf-8")
+    (machine / "registry" / "standards.json").write_text(
+        json.dumps({"registry_meta": {"authority": "derived_from_canonical_archive"}, "standards": mirror}, indent=2),
+        encoding="utf-8",
+    )
+    (web / "lib" / "registry.ts").write_text("export const registry = [\n" + "\n".join(blocks) + "\n];\n", encoding="utf-8")
+
+
+def run_gate(root: Path, jobs: int) -> dict[str, Any]:
+    report = root / "report.json"
+    command = [sys.executable, str(GATE), "--no-cache", "--jobs", str(jobs), "--report", str(report)]
+    for option in ("canonical", "records", "web", "machine"):
+        command += [f"--{option}-dir", str(root / option)]
+    started = time.perf_counter()
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    # wait4 reports the peak RSS of this run alone, not of every child so far. PDFs are parsed in
+    # forkserver workers that are not the gate's children, so their peak comes from the report.
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    wall = time.perf_counter() - started
+    result = load_json(report)
+    if process.returncode != 0:
+        raise RuntimeError(f"the gate blocked the synthetic release in {root}: {result.get('failures')} failure(s)")
+    peak_rss_mb = max(usage.ru_maxrss / 1024, result.get("pdf_worker_peak_rss_mb", 0))
+    return {"wall": wall, "phases": result["phases"], "peak_rss_mb": peak_rss_mb}
+
+
+def benchmark(scale: int, args: argparse.Namespace, work_dir: Path) -> dict[str, Any]:
+    count = BASE_STANDARDS * scale
+    root = work_dir / f"scale-{scale}"
+    started = time.perf_counter()
+    generate(root, count, args.pages, args.page_kb)
+    generated = time.perf_counter() - started
+    runs = [run_gate(root, args.jobs) for _ in range(args.runs)]
+    phases = {name: statistics.median(run["phases"].get(name, 0.0) for run in runs) for name in runs[0]["phases"]}
+    return {
+        "scale": scale,
+        "standards": count,
+        "pdfs": count * 4,
+        "generate": round(generated, 3),
+        "wall": round(statistics.median(run["wall"] for run in runs), 3),
+        "phases": {name: round(seconds, 3) for name, seconds in phases.items()},
+        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+    }
+
+
+def regressions(results: list[dict[str, Any]], previous: list[dict[str, Any]], threshold: float) -> list[str]:
+    found = []
+    previous_by_scale = {result["scale"]: result for result in previous}
+    for result in results:
+        before = previous_by_scale.get(result["scale"])
+        if before is None:
+            continue
+        for metric in ("wall", "peak_rss_mb"):
+            if result[metric] > before[metric] * (1 + threshold):
+                found.append(f"scale {result['scale']} {metric}: {before[metric]} -> {result[metric]}")
+    return found
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=positive_int, nargs="+", default=[1, 10, 100], help="multiples of 8 standards")
+    parser.add_argument("--pages", type=positive_int, default=12, help="pages per PDF (default: %(default)s)")
+    parser.add_argument("--page-kb", type=positive_int, default=4, help="text per page in KiB (default: %(default)s)")
+    parser.add_argument("--jobs", type=positive_int, default=os.cpu_count() or 1, help="gate --jobs (default: %(default)s)")
+    parser.add_argument("--runs", type=positive_int, default=3, help="gate runs per scale; the median is kept")
+    parser.add_argument("--work-dir", type=Path, help="keep the generated trees here instead of a temporary directory")
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--compare", type=Path, help="results JSON from an earlier run to check for regressions")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="fail when wall time or peak RSS grows by more than this fraction (default: %(default)s)",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="rulemark-bench-") as temporary:
+        work_dir = args.work_dir or Path(temporary)
+        results = []
+        print(f"{'scale':>6} {'stds':>6} {'pdfs':>6} {'wall s':>8} {'rss MB':>8}  phases")
+        for scale in args.scales:
+            try:
+                result = benchmark(scale, args, work_dir)
+            except RuntimeError as error:
+                print(f"[FATAL] {error}")
+                return 1
+            results.append(result)
+            phases = " ".join(f"{name}={seconds}" for name, seconds in result["phases"].items())
+            print(
+                f"{scale:>6} {result['standards']:>6} {result['pdfs']:>6} "
+                f"{result['wall']:>8.3f} {result['peak_rss_mb']:>8.1f}  {phases}"
+            )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"results": results}, indent=2) + "\n", encoding="utf-8")
+    if args.compare:
+        found = regressions(results, load_json(args.compare)["results"], args.threshold)
+        if found:
+            print(f"\nREGRESSION beyond {args.threshold:.0%}:")
+            for line in found:
+                print(f" - {line}")
+            return 1
+        print(f"\nNo regression beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
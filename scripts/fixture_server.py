@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Serve a recorded online fixture store over HTTP with injected latency.
+
+Point the gate at it with `verify_release.py --online --fixture-server HOST:PORT`.
+Every request is answered from the store by its Host header, path and query,
+so URLs on any host replay without network access.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from verify_release import DOWNLOAD_CHUNK_BYTES, FixtureStore, host_port
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self, address: tuple[str, int], store: FixtureStore, latency: float, jitter: float, bandwidth: int
+    ) -> None:
+        super().__init__(address, FixtureHandler)
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.requests = 0
+
+    def delay(self) -> float:
+        return max(0.0, self.latency + random.uniform(-self.jitter, self.jitter))
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the live site
+    server: FixtureServer
+
+    def do_GET(self) -> None:
+        self.server.requests += 1
+        time.sleep(self.server.delay())  # time to first byte
+        try:
+            fixture = self.server.store.response(f"http://{self.headers.get('Host', '')}{self.path}")
+        except (RuntimeError, OSError) as error:
+            body = f"{error}\n".encode("utf-8")
+            self.send_response(404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        body = fixture.read()
+        self.send_response(fixture.status)
+        self.send_header("Content-Length", str(len(body)))
+        location = fixture.getheader("Location")
+        if location is not None:
+            self.send_header("Location", location)
+        self.end_headers()
+        for start in range(0, len(body), DOWNLOAD_CHUNK_BYTES):
+            chunk = body[start : start + DOWNLOAD_CHUNK_BYTES]
+            self.wfile.write(chunk)
+            if self.server.bandwidth:
+                time.sleep(len(chunk) / self.server.bandwidth)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("fixtures", type=Path, help="fixture store written by --record-fixtures")
+    parser.add_argument("--listen", type=host_port, default=("127.0.0.1", 8765), help="HOST:PORT (default: 127.0.0.1:8765)")
+    parser.add_argument("--latency-ms", type=float, default=50, help="time to first byte (default: %(default)s)")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="uniform jitter around the latency (default: %(default)s)")
+    parser.add_argument("--bandwidth-kbps", type=int, default=0, help="per-response bandwidth in KiB/s, 0 for unlimited")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if not (args.fixtures / "index.json").exists():
+        print(f"[FATAL] No fixture store at {args.fixtures}")
+        return 1
+    store = FixtureStore(args.fixtures)
+    server = FixtureServer(
+        args.listen, store, args.latency_ms / 1000, args.jitter_ms / 1000, args.bandwidth_kbps * 1024
+    )
+    host, port = server.server_address[:2]
+    print(f"Serving {len(store.fixtures)} fixture(s) from {args.fixtures} on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Served {server.requests} request(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,40 +4,200 @@
 from __future__ import annotations
 
 import argparse
+import ctypes
+import ctypes.util
+import errno
+import functools
 import hashlib
+import http.client
+import io
 import json
+import lzma
+import mmap
+import multiprocessing
+import os
+import posixpath
 import re
+import resource
+import select
+import signal
+import sqlite3
+import ssl
+import stat as stat_module
+import struct
+import subprocess
 import sys
+import tarfile
+import threading
 import time
 import urllib.parse
-import urllib.request
-from pathlib import Path
-from typing import Any
+import xml.etree.ElementTree as ElementTree
+import zipfile
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path, PurePosixPath
+from typing import IO, Any, BinaryIO, Callable, Iterable, Iterator, Protocol, cast
 
 from pypdf import PdfReader
 
 
 class Gate:
-    def __init__(self) -> None:
+    def __init__(self, buffered: bool = False) -> None:
+        # A buffered gate holds its output lines until merged into its parent.
+        self.lines: list[str] | None = [] if buffered else None
         self.failures: list[str] = []
+        self.checks: list[dict[str, Any]] = []
+        self.phases: dict[str, float] = {}
+        self.worker_rss_kb = 0  # peak RSS of the PDF parsing workers, which the gate process never waits on
+        self.standard: str | None = None
+        self.category = "release"
+        self.clock = time.perf_counter()
 
-    def passed(self, message: str) -> None:
-        print(f"[PASS] {message}")
+    def fork(self) -> Gate:
+        return Gate(buffered=True)
 
-    def failed(self, message: str) -> None:
+    def merge(self, child: Gate, echo: bool = True) -> None:
+        self.failures.extend(child.failures)
+        self.checks.extend(child.checks)
+        if echo:
+            for line in child.lines or ():
+                self.emit(line)
+
+    def emit(self, line: str) -> None:
+        if self.lines is None:
+            print(line)
+        else:
+            self.lines.append(line)
+
+    @contextmanager
+    def scope(self, category: str, standard: str | None = None) -> Iterator[None]:
+        """Attribute the checks recorded inside to a category and standard."""
+        outer = self.category, self.standard
+        self.category, self.standard = category, standard
+        self.clock = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.category, self.standard = outer
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - started
+
+    def record(self, result: str, message: str, name: str | None, expected: Any, actual: Any) -> None:
+        # A check's duration is the time since the previous check in the same scope.
+        now = time.perf_counter()
+        self.checks.append(
+            {
+                "standard": self.standard,
+                "category": self.category,
+                "name": name or message,
+                "result": result,
+                "message": message,
+                "expected": report_value(expected),
+                "actual": report_value(actual),
+                "duration": round(now - self.clock, 6),
+            }
+        )
+        self.clock = now
+
+    def passed(self, message: str, expected: Any = None, actual: Any = None, name: str | None = None) -> None:
+        self.record("pass", message, name, expected, actual)
+        self.emit(f"[PASS] {message}")
+
+    def skipped(self, message: str) -> None:
+        self.record("skip", message, None, None, None)
+        self.emit(f"[SKIP] {message}")
+
+    def failed(self, message: str, expected: Any = None, actual: Any = None, name: str | None = None) -> None:
         self.failures.append(message)
-        print(f"[FAIL] {message}")
+        self.record("fail", message, name, expected, actual)
+        self.emit(f"[FAIL] {message}")
+
+    def replay(self, check: dict[str, Any]) -> None:
+        """Re-record a check taken from another run's JSON report."""
+        self.checks.append(check)
+        if check["result"] == "fail":
+            self.failures.append(check["message"])
+        self.emit(f"[{check['result'].upper()}] {check['message']}")
 
     def equal(self, actual: Any, expected: Any, label: str) -> None:
         if actual == expected:
-            self.passed(label)
+            self.passed(label, expected, actual)
         else:
-            self.failed(f"{label}: expected {expected!r}, got {actual!r}")
+            self.failed(f"{label}: expected {expected!r}, got {actual!r}", expected, actual, label)
 
 
-def load_json(path: Path) -> dict[str, Any]:
-    with path.open("r", encoding="utf-8") as handle:
-        return json.load(handle)
+def report_value(value: Any) -> Any:
+    """Make an expected or actual value JSON-serializable for the report."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    if isinstance(value, bytes):
+        return f"<{len(value)} bytes, sha256:{sha256_bytes(value)}>"
+    if value is None or isinstance(value, (str, int, float, bool, list, dict)):
+        return value
+    return repr(value)
+
+
+def write_json_report(
+    path: Path, gate: Gate, standards: list[dict[str, Any]], duration: float, shard: tuple[int, int] | None = None
+) -> None:
+    report = {
+        "gate": "RuleMark Integrity Gate",
+        "result": "fail" if gate.failures else "pass",
+        "shard": {"index": shard[0], "count": shard[1]} if shard is not None else None,
+        "standards": [standard["canonical_id"] for standard in standards],
+        "failures": len(gate.failures),
+        "duration": round(duration, 6),
+        "phases": {name: round(seconds, 6) for name, seconds in gate.phases.items()},
+        "pdf_worker_peak_rss_mb": round(gate.worker_rss_kb / 1024, 1),
+        "checks": gate.checks,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+
+def write_junit_report(path: Path, gate: Gate, duration: float) -> None:
+    suites = ElementTree.Element("testsuites", name="RuleMark Integrity Gate", time=f"{duration:.6f}")
+    by_standard: dict[str, list[dict[str, Any]]] = {"release": []}
+    for check in gate.checks:
+        by_standard.setdefault(check["standard"] or "release", []).append(check)
+    for standard, checks in by_standard.items():
+        suite = ElementTree.SubElement(
+            suites,
+            "testsuite",
+            name=standard,
+            tests=str(len(checks)),
+            failures=str(sum(check["result"] == "fail" for check in checks)),
+            skipped=str(sum(check["result"] == "skip" for check in checks)),
+            time=f"{sum(check['duration'] for check in checks):.6f}",
+        )
+        if standard == "release":
+            properties = ElementTree.SubElement(suite, "properties")
+            for name, seconds in gate.phases.items():
+                ElementTree.SubElement(properties, "property", name=f"phase.{name}", value=f"{seconds:.6f}")
+        for check in checks:
+            case = ElementTree.SubElement(
+                suite, "testcase", classname=f"{standard}.{check['category']}", name=check["name"], time=f"{check['duration']:.6f}"
+            )
+            if check["result"] == "fail":
+                failure = ElementTree.SubElement(case, "failure", message=check["message"])
+                failure.text = f"expected: {check['expected']!r}\nactual: {check['actual']!r}"
+            elif check["result"] == "skip":
+                ElementTree.SubElement(case, "skipped", message=check["message"])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ElementTree.ElementTree(suites).write(path, encoding="utf-8", xml_declaration=True)
+
+
+def load_json(path: ReleasePath) -> dict[str, Any]:
+    return json.loads(path.read_text(encoding="utf-8"))
 
 
 def sha256_bytes(data: bytes) -> str:
@@ -48,61 +208,1045 @@ def normalize_text(value: str) -> str:
     return " ".join(value.split())
 
 
-def pdf_facts(path: Path) -> tuple[str, int, int, str]:
-    data = path.read_bytes()
-    reader = PdfReader(path)
-    text = normalize_text("\n".join(page.extract_text() or "" for page in reader.pages))
-    return sha256_bytes(data), len(data), len(reader.pages), text
+class Bundle(ABC):
+    """A release tree that is not a plain directory: an archive, or a commit in git."""
+
+    root = "."
+
+    def index(self, members: Iterable[str]) -> None:
+        self.names = {PurePosixPath(name).as_posix(): name for name in members}
+        self.directories = {parent.as_posix() for name in self.names for parent in PurePosixPath(name).parents}
+
+    @abstractmethod
+    def read(self, name: str) -> bytes:
+        """The bytes of a member."""
+
+    @abstractmethod
+    def digest(self, name: str) -> tuple[str, int]:
+        """SHA-256 and size of a member, hashed as it streams past."""
+
+    @abstractmethod
+    def reference(self, name: str) -> MemberReference:
+        """A handle a PDF parsing worker opens itself, so the member is not copied to it."""
+
+    @abstractmethod
+    def identity(self, name: str) -> tuple[str, int, int, int]:
+        """A (path, size, mtime_ns, inode) identity for the PDF facts cache."""
+
+    @abstractmethod
+    def locate(self, name: str) -> str:
+        """A human-readable location for messages."""
+
+
+def resolve_links(files: Iterable[str], links: dict[str, str]) -> tuple[dict[str, str], dict[str, str]]:
+    """Follow each link, through other links, to a file of the bundle.
+
+    links maps a link's name to its target as a bundle path. Returns the file
+    each resolvable link names, and the reason each other link cannot be read.
+    """
+    files = {posixpath.normpath(name): name for name in files}
+    pending = {posixpath.normpath(name): posixpath.normpath(target) for name, target in links.items()}
+    directories = {parent.as_posix() for name in files for parent in PurePosixPath(name).parents}
+    resolved, unsupported = {}, {}
+    for name in links:
+        target, seen = pending[posixpath.normpath(name)], {posixpath.normpath(name)}
+        while target in pending and target not in seen:
+            seen.add(target)
+            target = pending[target]
+        if target in files:
+            resolved[name] = files[target]
+        elif target in seen:
+            unsupported[name] = "unsupported link member: link loop"
+        elif target in directories:
+            unsupported[name] = f"unsupported link member: {target} is a directory"
+        else:
+            unsupported[name] = f"unsupported link member: {target} is not in the bundle"
+    return resolved, unsupported
+
+
+class MemberReference:
+    """Where a bundle member lives, in a form that pickles into a worker process.
+
+    kind is "zip", "tar" (a plain tar, read at offset), "tar-stream" (a
+    compressed tar, decompressed up to the member) or "git" (a blob id).
+    """
+
+    def __init__(self, kind: str, path: Path, member: str, offset: int = 0, size: int = 0) -> None:
+        self.kind = kind
+        self.path = path
+        self.member = member
+        self.offset = offset
+        self.size = size
+
+    def read(self) -> bytes:
+        if self.kind == "zip":
+            with zipfile.ZipFile(self.path) as archive:
+                return archive.read(self.member)
+        if self.kind == "tar":
+            with self.path.open("rb") as handle:
+                data = os.pread(handle.fileno(), self.size, self.offset)
+            if len(data) != self.size:
+                raise OSError(f"{self.path}!/{self.member}: truncated tar member")
+            return data
+        if self.kind == "tar-stream":
+            with tarfile.open(self.path, mode="r|*") as archive:
+                for member in archive:
+                    if member.name == self.member:
+                        extracted = archive.extractfile(member)
+                        assert extracted is not None
+                        return extracted.read()
+            raise OSError(f"{self.path}!/{self.member}: member vanished from the archive")
+        completed = subprocess.run(["git", "-C", str(self.path), "cat-file", "blob", self.member], capture_output=True)
+        if completed.returncode != 0:
+            raise OSError(f"git cat-file cannot read {self.member} in {self.path}")
+        return completed.stdout
+
+
+class ArchiveBundle(Bundle):
+    """A zip or tar release bundle, read member by member without extracting it.
+
+    Nothing is extracted to disk, and a member is hashed as it streams past.
+    Zip members are decompressed on demand. A plain tar is indexed in one
+    pass that records each regular file's data offset, and members are read
+    with pread. A compressed tar cannot be seeked, so the indexing pass
+    hashes every member as it decompresses and keeps members of at most
+    SMALL_MEMBER_BYTES (signatures, registries) in memory; a larger member
+    is decompressed again from the start of the stream when it is read.
+    PDF parsing workers open the archive themselves instead of being sent
+    the member's bytes. Hard links and symlinks resolve to the file they
+    point to inside the bundle; a link that cannot be resolved reads as an
+    "unsupported link member" error rather than going missing. A single
+    top-level directory, as produced by most release tooling, is treated as
+    the bundle root.
+    """
+
+    COMPRESSED_MAGIC = (b"\x1f\x8b", b"BZh", b"\xfd7zXZ\x00")  # gzip, bzip2, xz
+    SMALL_MEMBER_BYTES = 64 * 1024
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        stat = path.stat()
+        self.stamp = stat.st_mtime_ns, stat.st_ino
+        self.lock = threading.Lock()
+        self.zip: zipfile.ZipFile | None = None
+        self.tar: BinaryIO | None = None  # an uncompressed tar, read in place
+        self.compressed = False
+        self.offsets: dict[str, tuple[int, int]] = {}
+        self.digests: dict[str, tuple[str, int]] = {}  # a compressed tar's members, hashed while indexing
+        self.small: dict[str, bytes] = {}  # a compressed tar's small members
+        self.links: dict[str, str] = {}  # link member -> the regular member it resolves to
+        self.unsupported: dict[str, str] = {}  # member -> why it cannot be read
+        links: dict[str, str] = {}  # link member -> its target, as a bundle path
+        if zipfile.is_zipfile(path):
+            self.zip = zipfile.ZipFile(path)
+            self.sizes = {}
+            for info in self.zip.infolist():
+                if info.is_dir():
+                    continue
+                if info.create_system == 3 and stat_module.S_ISLNK(info.external_attr >> 16):
+                    target = self.zip.read(info).decode("utf-8", errors="replace")
+                    links[info.filename] = posixpath.join(posixpath.dirname(info.filename), target)
+                else:
+                    self.sizes[info.filename] = info.file_size
+        else:
+            with path.open("rb") as handle:
+                self.compressed = handle.read(6).startswith(self.COMPRESSED_MAGIC)
+            if not self.compressed:
+                self.tar = path.open("rb")
+            try:
+                # Stream mode reads a compressed tar front to back without seeking.
+                with tarfile.open(path, mode="r|*") if self.compressed else tarfile.open(fileobj=self.tar, mode="r:") as archive:
+                    for member in archive:
+                        if member.issparse():
+                            self.unsupported[member.name] = "unsupported sparse member"
+                        elif member.isfile():
+                            self.offsets[member.name] = member.offset_data, member.size
+                            if self.compressed:
+                                self.index_member(member.name, archive.extractfile(member))
+                        elif member.islnk():
+                            links[member.name] = member.linkname  # hard links name an archive member
+                        elif member.issym():
+                            links[member.name] = posixpath.join(posixpath.dirname(member.name), member.linkname)
+            except BaseException:
+                if self.tar is not None:
+                    self.tar.close()
+                raise
+            self.sizes = {name: size for name, (_, size) in self.offsets.items()}
+        self.links, unsupported = resolve_links(self.sizes, links)
+        self.unsupported.update(unsupported)
+        self.sizes.update({name: self.sizes[target] for name, target in self.links.items()})
+        self.sizes.update({name: 0 for name in self.unsupported})
+        self.index(self.sizes)
+        tops = {PurePosixPath(name).parts[0] for name in self.names}
+        if len(tops) == 1 and tops <= self.directories:
+            self.root = tops.pop()
+
+    def index_member(self, member: str, handle: IO[bytes] | None) -> None:
+        assert handle is not None
+        chunks: list[bytes] = []
+        small = self.offsets[member][1] <= self.SMALL_MEMBER_BYTES
+        self.digests[member] = hash_stream(handle, chunks.append if small else None)
+        if small:
+            self.small[member] = b"".join(chunks)
+
+    def member(self, name: str) -> str:
+        """The regular member a name reads, following links."""
+        member = self.names[name]
+        if member in self.unsupported:
+            raise OSError(f"{self.locate(name)}: {self.unsupported[member]}")
+        return self.links.get(member, member)
+
+    def read(self, name: str) -> bytes:
+        member = self.member(name)
+        if member in self.small:
+            return self.small[member]
+        if self.tar is not None:
+            offset, size = self.offsets[member]
+            data = os.pread(self.tar.fileno(), size, offset)
+            if len(data) != size:
+                raise OSError(f"{self.locate(name)}: truncated tar member")
+            return data
+        if self.compressed:
+            return self.reference(name).read()
+        assert self.zip is not None
+        try:
+            with self.lock:  # one ZipFile handle is shared by the checking threads
+                return self.zip.read(member)
+        except (zipfile.BadZipFile, zlib.error) as error:
+            raise OSError(f"{self.locate(name)}: {error}") from None
+
+    def digest(self, name: str) -> tuple[str, int]:
+        member = self.member(name)
+        if self.compressed:
+            return self.digests[member]
+        if self.tar is not None:
+            offset, size = self.offsets[member]
+            digest = hashlib.sha256()
+            for start in range(offset, offset + size, HASH_CHUNK_BYTES):
+                digest.update(os.pread(self.tar.fileno(), min(HASH_CHUNK_BYTES, offset + size - start), start))
+            return digest.hexdigest(), size
+        assert self.zip is not None
+        try:
+            with self.lock, self.zip.open(member) as handle:
+                return hash_stream(handle)
+        except (zipfile.BadZipFile, zlib.error) as error:
+            raise OSError(f"{self.locate(name)}: {error}") from None
+
+    def reference(self, name: str) -> MemberReference:
+        member = self.member(name)
+        if self.zip is not None:
+            return MemberReference("zip", self.path, member)
+        if self.compressed:
+            return MemberReference("tar-stream", self.path, member)
+        return MemberReference("tar", self.path, member, *self.offsets[member])
+
+    def identity(self, name: str) -> tuple[str, int, int, int]:
+        return self.locate(name), self.sizes[self.names[name]], *self.stamp
+
+    def locate(self, name: str) -> str:
+        return f"{self.path}!/{name}"
+
+
+class GitRepository:
+    """A git repository read through one long-lived `git cat-file --batch` process."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.process = subprocess.Popen(
+            ["git", "-C", str(path), "cat-file", "--batch"], stdin=subprocess.PIPE, stdout=subprocess.PIPE
+        )
+
+    def git(self, *arguments: str) -> bytes:
+        completed = subprocess.run(["git", "-C", str(self.path), *arguments], capture_output=True)
+        if completed.returncode != 0:
+            raise OSError(f"git {arguments[0]} failed in {self.path}: {completed.stderr.decode(errors='replace').strip()}")
+        return completed.stdout
+
+    def tree(self, ref: str) -> dict[str, tuple[str, str, int]]:
+        """Mode, blob id and size of every file and symlink in the tree of ref."""
+        blobs = {}
+        for record in self.git("ls-tree", "-r", "-l", "-z", ref).split(b"\0"):
+            if record:
+                meta, _, name = record.partition(b"\t")
+                mode, kind, blob, size = meta.split()
+                if kind == b"blob":
+                    blobs[name.decode("utf-8")] = mode.decode("ascii"), blob.decode("ascii"), int(size)
+        return blobs
+
+    def tags(self, pattern: str) -> list[str]:
+        return self.git("tag", "--list", pattern, "--sort=version:refname").decode("utf-8").split()
+
+    def read(self, blob: str) -> bytes:
+        chunks: list[bytes] = []
+        self.stream(blob, chunks.append)
+        return b"".join(chunks)
+
+    def digest(self, blob: str) -> tuple[str, int]:
+        digest = hashlib.sha256()
+        size = self.stream(blob, digest.update)
+        return digest.hexdigest(), size
+
+    def stream(self, blob: str, sink: Callable[[bytes], Any]) -> int:
+        """Pass a blob to sink in chunks; return its size."""
+        assert self.process.stdin is not None and self.process.stdout is not None
+        with self.lock:
+            self.process.stdin.write(f"{blob}\n".encode("ascii"))
+            self.process.stdin.flush()
+            header = self.process.stdout.readline().split()
+            if len(header) != 3:
+                raise OSError(f"git cat-file cannot read {blob} in {self.path}: {b' '.join(header).decode()}")
+            remaining = size = int(header[2])
+            while remaining:
+                chunk = self.process.stdout.read(min(remaining, HASH_CHUNK_BYTES))
+                if not chunk:
+                    raise OSError(f"git cat-file stopped in the middle of {blob} in {self.path}")
+                sink(chunk)
+                remaining -= len(chunk)
+            self.process.stdout.read(1)  # the newline after each object
+        return size
+
+
+@functools.lru_cache(maxsize=None)
+def git_repository(path: Path) -> GitRepository:
+    # Every ref read from a repository shares its cat-file process.
+    return GitRepository(path)
+
+
+class GitBundle(Bundle):
+    """The tree of one commit, read from git objects without a checkout.
+
+    Blobs are content-addressed, so a PDF's cache identity is its blob id:
+    a PDF left unchanged across releases is hashed and parsed only once.
+    A symlink (mode 120000) reads as the file it points to in the same tree,
+    as it would in a checkout.
+    """
+
+    SYMLINK_MODE = "120000"
+
+    def __init__(self, repository: GitRepository, ref: str) -> None:
+        self.repository = repository
+        self.ref = ref
+        tree = repository.tree(ref)
+        self.blobs = {name: (blob, size) for name, (mode, blob, size) in tree.items() if mode != self.SYMLINK_MODE}
+        links = {
+            name: posixpath.join(posixpath.dirname(name), repository.read(blob).decode("utf-8", errors="replace"))
+            for name, (mode, blob, _) in tree.items()
+            if mode == self.SYMLINK_MODE
+        }
+        resolved, self.unsupported = resolve_links(self.blobs, links)
+        self.blobs.update({name: self.blobs[target] for name, target in resolved.items()})
+        self.index([*self.blobs, *self.unsupported])
+
+    def blob(self, name: str) -> str:
+        member = self.names[name]
+        if member in self.unsupported:
+            raise OSError(f"{self.locate(name)}: {self.unsupported[member]}")
+        return self.blobs[member][0]
+
+    def read(self, name: str) -> bytes:
+        return self.repository.read(self.blob(name))
+
+    def digest(self, name: str) -> tuple[str, int]:
+        return self.repository.digest(self.blob(name))
+
+    def reference(self, name: str) -> MemberReference:
+        return MemberReference("git", self.repository.path, self.blob(name))
+
+    def identity(self, name: str) -> tuple[str, int, int, int]:
+        member = self.names[name]
+        if member in self.unsupported:
+            return self.locate(name), 0, 0, 0
+        blob, size = self.blobs[member]
+        return f"git-blob:{blob}", size, 0, 0
+
+    def locate(self, name: str) -> str:
+        return f"{self.repository.path}@{self.ref}:{name}"
+
+
+class BundlePath:
+    """A path inside a Bundle, standing in for the few Path methods the gate uses."""
+
+    def __init__(self, bundle: Bundle, name: str) -> None:
+        self.bundle = bundle
+        self.name = name
+
+    def __truediv__(self, other: str) -> BundlePath:
+        return BundlePath(self.bundle, (PurePosixPath(self.name) / other).as_posix())
+
+    def __str__(self) -> str:
+        return self.bundle.locate(self.name)
+
+    def __repr__(self) -> str:
+        return f"BundlePath({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BundlePath) and (self.bundle, self.name) == (other.bundle, other.name)
+
+    def __hash__(self) -> int:
+        return hash((id(self.bundle), self.name))
+
+    def exists(self) -> bool:
+        return self.name in self.bundle.names or self.name in self.bundle.directories
+
+    def identity(self) -> tuple[str, int, int, int]:
+        return self.bundle.identity(self.name)
+
+    def digest(self) -> tuple[str, int]:
+        try:
+            return self.bundle.digest(self.name)
+        except KeyError:
+            raise FileNotFoundError(f"No such bundle member: {self}") from None
+
+    def reference(self) -> MemberReference:
+        try:
+            return self.bundle.reference(self.name)
+        except KeyError:
+            raise FileNotFoundError(f"No such bundle member: {self}") from None
+
+    def read_bytes(self) -> bytes:
+        try:
+            return self.bundle.read(self.name)
+        except KeyError:
+            raise FileNotFoundError(f"No such bundle member: {self}") from None
+
+    def read_text(self, encoding: str = "utf-8") -> str:
+        return self.read_bytes().decode(encoding)
+
+
+ReleasePath = Path | BundlePath
+
+
+def release_source(value: str) -> ReleasePath:
+    """A release directory, the root of a bundle file, or REPOSITORY@REF for a git commit."""
+    path = Path(value)
+    repository, at, ref = value.rpartition("@")
+    if not path.exists() and at and Path(repository).is_dir():
+        try:
+            return BundlePath(GitBundle(git_repository(Path(repository).resolve()), ref), ".")
+        except OSError as error:
+            raise argparse.ArgumentTypeError(str(error)) from None
+    if not path.is_file():
+        return path
+    try:
+        bundle = ArchiveBundle(path)
+    except tarfile.ReadError:
+        raise argparse.ArgumentTypeError(f"{value} is neither a directory nor a zip or tar release bundle") from None
+    except (OSError, EOFError, lzma.LZMAError, tarfile.TarError, zipfile.BadZipFile) as error:
+        raise argparse.ArgumentTypeError(f"cannot read release bundle {value}: {error}") from None
+    return BundlePath(bundle, bundle.root)
+
+
+PdfFacts = tuple[str, int, int, str]
+
 
+class PdfFactsError(Exception):
+    """A PDF could not be hashed or parsed."""
 
-def standard_block(source: str, canonical_id: str) -> str | None:
-    marker = f'canonical_id: "{canonical_id}"'
-    start = source.find(marker)
-    if start < 0:
+
+class PdfParseLimit(PdfFactsError):
+    """Parsing a PDF exceeded the sandbox's CPU-time, wall-clock or memory limit."""
+
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def hash_stream(handle: IO[bytes] | io.BufferedIOBase, keep: Callable[[bytes], Any] | None = None) -> tuple[str, int]:
+    """SHA-256 and size of a stream read in fixed-size chunks, each also passed to keep if given."""
+    digest, size = hashlib.sha256(), 0
+    while chunk := handle.read(HASH_CHUNK_BYTES):
+        digest.update(chunk)
+        size += len(chunk)
+        if keep is not None:
+            keep(chunk)
+    return digest.hexdigest(), size
+
+
+@contextmanager
+def map_file(path: Path) -> Iterator[io.BytesIO | mmap.mmap]:
+    """Map a file read-only so hashing and parsing share one view of it."""
+    with path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            yield io.BytesIO()  # empty files cannot be mapped
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapping.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapping
+
+
+def digest_mapping(mapping: io.BytesIO | mmap.mmap) -> tuple[str, int]:
+    # Hash in fixed-size slices so memory stays bounded for very large files.
+    digest = hashlib.sha256()
+    with memoryview(mapping.getbuffer() if isinstance(mapping, io.BytesIO) else mapping) as view:
+        for start in range(0, len(view), HASH_CHUNK_BYTES):
+            digest.update(view[start:start + HASH_CHUNK_BYTES])
+        return digest.hexdigest(), len(view)
+
+
+class IdentityMatcher:
+    """Aho-Corasick scan for every identity fragment in a single pass.
+
+    Text may be fed page by page: the automaton state carries over between
+    calls, so a fragment that straddles a page boundary is still found.
+    """
+
+    def __init__(self, fragments: Iterable[str]) -> None:
+        self.goto: list[dict[str, int]] = [{}]
+        self.fail: list[int] = [0]
+        self.output: list[tuple[str, ...]] = [()]
+        self.pending: set[str] = set()
+        for fragment in fragments:
+            if not fragment:
+                continue  # the empty string is contained in any text
+            self.pending.add(fragment)
+            state = 0
+            for char in fragment:
+                if char not in self.goto[state]:
+                    self.goto[state][char] = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = self.goto[state][char]
+            self.output[state] += (fragment,)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, child in self.goto[state].items():
+                queue.append(child)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                self.output[child] += self.output[self.fail[child]]
+        self.state = 0
+
+    @property
+    def done(self) -> bool:
+        return not self.pending
+
+    def feed(self, text: str) -> None:
+        state = self.state
+        for char in text:
+            if not self.pending:
+                break
+            while state and char not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(char, 0)
+            if self.output[state]:
+                self.pending.difference_update(self.output[state])
+        self.state = state
+
+
+def identity_fragments(standard: dict[str, Any]) -> tuple[str, ...]:
+    identity = standard["pdf_identity"]
+    fragments = [normalize_text(required) for required in identity["required_text"]]
+    if identity["mode"] == "canonical_id_and_title":
+        fragments.append(standard["canonical_id"])
+    return tuple(dict.fromkeys(fragments))
+
+
+PdfText = tuple[int, str, int]
+
+
+def pdf_text(source: BinaryIO | mmap.mmap, fragments: Iterable[str] | None = None) -> PdfText:
+    """Return (pages, normalized text, pages extracted).
+
+    With fragments, pages are extracted one at a time and extraction stops
+    once all of them have been seen; the text is then a prefix of the full
+    normalized text. Without fragments every page is extracted.
+    """
+    # Given a path, pypdf would copy the whole file into memory; a mapping is read in place.
+    # An mmap has the read/seek/tell file protocol pypdf relies on, though it is not typed as IO.
+    reader = PdfReader(cast(BinaryIO, source))
+    page_count = len(reader.pages)
+    matcher = IdentityMatcher(fragments) if fragments is not None else None
+    parts: list[str] = []
+    for index, page in enumerate(reader.pages):
+        # Joining per-page words with single spaces equals normalize_text() of the joined pages.
+        words = (page.extract_text() or "").split()
+        if words:
+            chunk = (" " if parts else "") + " ".join(words)
+            parts.append(chunk)
+            if matcher is not None:
+                matcher.feed(chunk)
+        if matcher is not None and matcher.done:
+            return page_count, "".join(parts), index + 1
+    return page_count, "".join(parts), page_count
+
+
+def out_of_memory(error: BaseException | None) -> bool:
+    """Whether error, or an exception it was raised from, is an allocation failure."""
+    # Under RLIMIT_AS a failed mmap or malloc often surfaces as OSError(ENOMEM), not MemoryError.
+    while error is not None:
+        if isinstance(error, MemoryError) or (isinstance(error, OSError) and error.errno == errno.ENOMEM):
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def pdf_text_worker(
+    connection: Any, source: Path | MemberReference, fragments: Iterable[str] | None, cpu_seconds: int, memory_bytes: int
+) -> None:
+    """Sandbox entry point: apply the limits, parse, and send back plain data with the worker's peak RSS."""
+    # Past the soft CPU limit the kernel sends SIGXCPU, past the hard one SIGKILL.
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    # Only plain data crosses the process boundary; parser exceptions may not pickle.
+    outcome: tuple[str, Any]
+    try:
+        if isinstance(source, MemberReference):
+            # The member is read here, under the memory limit, rather than copied from the gate.
+            outcome = "ok", pdf_text(io.BytesIO(source.read()), fragments)
+        else:
+            with map_file(source) as mapping:
+                outcome = "ok", pdf_text(mapping, fragments)
+    except Exception as error:
+        if out_of_memory(error):
+            outcome = "limit", f"exceeded the {memory_bytes // (1024 * 1024)} MiB memory limit"
+        else:
+            outcome = "error", str(error)
+    connection.send((*outcome, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+    connection.close()
+
+
+class PdfSandbox:
+    """Parse each PDF in a throwaway worker process under resource limits.
+
+    A malformed or adversarial PDF can send pypdf into pathological time or
+    memory use. Each parse gets its own process with RLIMIT_CPU and RLIMIT_AS
+    set, and the parent also enforces a wall-clock deadline, since a worker
+    that is stuck off-CPU is never charged CPU time. A worker that hits any
+    limit is killed and the PDF fails closed with PdfParseLimit. Workers
+    report their peak RSS, since the gate process never waits on them and
+    its own rusage leaves them out.
+    """
+
+    WALL_CLOCK_FACTOR = 4
+
+    def __init__(self, cpu_seconds: int, memory_bytes: int) -> None:
+        self.cpu_seconds = cpu_seconds
+        self.memory_bytes = memory_bytes
+        self.peak_rss_kb = 0
+        self.lock = threading.Lock()
+        # Workers fork from a single-threaded server, never from the gate's checking threads.
+        self.context = multiprocessing.get_context("forkserver")
+        self.context.set_forkserver_preload(["pypdf"])
+
+    def parse(self, path: ReleasePath, fragments: Iterable[str] | None = None) -> PdfText | PdfFactsError:
+        try:
+            source = path.reference() if isinstance(path, BundlePath) else path
+        except OSError as error:
+            return PdfFactsError(str(error))
+        receiver, sender = self.context.Pipe(duplex=False)
+        worker = self.context.Process(
+            target=pdf_text_worker,
+            args=(sender, source, None if fragments is None else tuple(fragments), self.cpu_seconds, self.memory_bytes),
+            daemon=True,
+        )
+        worker.start()
+        sender.close()
+        deadline = self.cpu_seconds * self.WALL_CLOCK_FACTOR
+        try:
+            if not receiver.poll(deadline):
+                return PdfParseLimit(f"exceeded the {deadline} s wall-clock limit")
+            try:
+                status, value, rss_kb = receiver.recv()
+            except EOFError:
+                worker.join()
+                if worker.exitcode in (-signal.SIGXCPU, -signal.SIGKILL):
+                    return PdfParseLimit(f"exceeded the {self.cpu_seconds} s CPU-time limit")
+                return PdfFactsError(f"PDF parser exited with code {worker.exitcode}")
+        finally:
+            receiver.close()
+            worker.kill()
+            worker.join()
+        with self.lock:
+            self.peak_rss_kb = max(self.peak_rss_kb, rss_kb)
+        if status == "ok":
+            return value
+        return PdfParseLimit(value) if status == "limit" else PdfFactsError(value)
+
+
+def default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "rulemark" / "pdf-facts.sqlite3"
+
+
+class PdfFactsCache:
+    """On-disk PDF facts keyed by SHA-256, with a file-identity shortcut.
+
+    A file whose (path, size, mtime, inode) was seen before is answered
+    without reading it. Otherwise the file is hashed and the facts are
+    looked up by digest, so a copied or touched PDF is still not re-parsed.
+    Entries are evicted least recently used once the cache exceeds max_bytes.
+    """
+
+    SCHEMA_VERSION = 2
+
+    def __init__(self, path: Path, max_bytes: int) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # Checking threads reach the cache only under ReleaseFiles.lock.
+        self.connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        if self.connection.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+            self.connection.executescript("DROP TABLE IF EXISTS facts; DROP TABLE IF EXISTS files;")
+            self.connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS facts (
+                sha256 TEXT PRIMARY KEY,
+                bytes INTEGER NOT NULL,
+                pages INTEGER NOT NULL,
+                text TEXT NOT NULL,
+                scanned INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                inode INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            );
+            """
+        )
+
+    @staticmethod
+    def identity(path: ReleasePath) -> tuple[str, int, int, int]:
+        if isinstance(path, BundlePath):
+            return path.identity()
+        stat = path.stat()
+        return str(path.resolve()), stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+    def digest(self, path: ReleasePath) -> tuple[str, int] | None:
+        identity = self.identity(path)
+        row = self.connection.execute(
+            "SELECT sha256 FROM files WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?", identity
+        ).fetchone()
+        return (row[0], identity[1]) if row else None
+
+    def remember(self, path: ReleasePath, digest: str) -> None:
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", (*self.identity(path), digest))
+
+    def text(self, digest: str) -> PdfText | None:
+        row = self.connection.execute("SELECT pages, text, scanned FROM facts WHERE sha256 = ?", (digest,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute("UPDATE facts SET last_used = ? WHERE sha256 = ?", (time.time(), digest))
+        return row
+
+    def store(self, digest: str, byte_count: int, parsed: PdfText) -> None:
+        page_count, text, scanned = parsed
+        size = len(text.encode("utf-8")) + len(digest)
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO facts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (digest, byte_count, page_count, text, scanned, size, time.time()),
+            )
+            self.evict()
+
+    def evict(self) -> None:
+        total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM facts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for digest, size in self.connection.execute("SELECT sha256, size FROM facts ORDER BY last_used").fetchall():
+            self.connection.execute("DELETE FROM facts WHERE sha256 = ?", (digest,))
+            self.connection.execute("DELETE FROM files WHERE sha256 = ?", (digest,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+def file_stamp(path: ReleasePath) -> tuple[int, int, int, int] | None:
+    """(st_dev, st_ino, st_size, st_mtime_ns) of a file, or None if it is gone or inside a bundle."""
+    if isinstance(path, BundlePath):
         return None
-    next_start = source.find('schema_version: "1.0"', start + len(marker))
-    return source[start:next_start if next_start >= 0 else len(source)]
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class ReleaseFiles:
+    """Registry of PDF digests for a run or a tag sweep, so identical bytes are parsed once.
+
+    Records PDFs, aliases, Canonical Archive PDFs and Machine Interface
+    artifacts are usually the same file under different names. Each file
+    identity is hashed once; each distinct digest is parsed once, only as far
+    as needed to find the identity fragments the gate will look for.
+    """
+
+    def __init__(self, sandbox: PdfSandbox, jobs: int = 1, cache: PdfFactsCache | None = None) -> None:
+        self.sandbox = sandbox
+        self.jobs = jobs
+        self.cache = cache
+        self.digests: dict[ReleasePath, tuple[str, int] | PdfFactsError] = {}
+        self.stamps: dict[ReleasePath, tuple[int, int, int, int] | None] = {}  # each file as it was when hashed
+        self.identities: dict[tuple[str, int, int, int], tuple[str, int]] = {}
+        self.texts: dict[str, PdfText | PdfFactsError] = {}
+        self.lock = threading.RLock()  # standards may be checked on several threads
+
+    def identify(self, path: ReleasePath) -> tuple[str, int]:
+        identity = PdfFactsCache.identity(path)
+        if identity not in self.identities:
+            digest = self.cache.digest(path) if self.cache is not None else None
+            if digest is None:
+                if isinstance(path, BundlePath):
+                    digest = path.digest()
+                else:
+                    with map_file(path) as mapping:
+                        digest = digest_mapping(mapping)
+                if self.cache is not None:
+                    self.cache.remember(path, digest[0])
+            self.identities[identity] = digest
+        return self.identities[identity]
+
+    def collect(self, pdfs: list[tuple[ReleasePath, tuple[str, ...]]], parse: bool = True) -> None:
+        """Hash every path and, unless parse is false, extract text per distinct digest."""
+        with self.lock:
+            self.collect_locked(pdfs, parse)
+
+    def collect_locked(self, pdfs: list[tuple[ReleasePath, tuple[str, ...]]], parse: bool) -> None:
+        fragments_by_digest: dict[str, set[str]] = {}
+        pending: dict[str, ReleasePath] = {}
+        sizes: dict[str, int] = {}
+        for path, fragments in pdfs:
+            known = self.digests.get(path)
+            if known is None and not path.exists():
+                continue
+            if known is not None and (not parse or isinstance(known, PdfFactsError) or known[0] in self.texts):
+                continue
+            if known is None:
+                self.stamps[path] = file_stamp(path)
+                try:
+                    known = self.digests[path] = self.identify(path)
+                except OSError as error:
+                    self.digests[path] = PdfFactsError(str(error))
+                    continue
+            if not parse:
+                continue
+            digest, byte_count = known
+            fragments_by_digest.setdefault(digest, set()).update(fragments)
+            if digest in self.texts or digest in pending:
+                continue
+            cached = self.cache.text(digest) if self.cache is not None else None
+            if cached is not None:
+                self.texts[digest] = cached
+            else:
+                pending[digest] = path
+                sizes[digest] = byte_count
+        if pending:
+            # Fragments wanted by every path sharing a digest, so one parse serves them all.
+            wanted = [fragments_by_digest[digest] for digest in pending]
+            # Each sandboxed parse is its own process; the threads only wait on them.
+            with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                for digest, parsed in zip(pending, executor.map(self.sandbox.parse, pending.values(), wanted)):
+                    self.parsed(digest, sizes[digest], parsed)
+
+    def parsed(self, digest: str, byte_count: int, parsed: PdfText | PdfFactsError) -> None:
+        self.texts[digest] = parsed
+        if self.cache is not None and not isinstance(parsed, PdfFactsError):
+            self.cache.store(digest, byte_count, parsed)
+
+    def forget(self, paths: Iterable[ReleasePath] | None = None) -> None:
+        """Drop the digests of paths that changed on disk, or of every path, so they are hashed again."""
+        with self.lock:
+            if paths is None:
+                self.digests.clear()
+                self.stamps.clear()
+                self.identities.clear()
+                return
+            for path in paths:
+                self.digests.pop(path, None)
+                self.stamps.pop(path, None)
+
+    def revalidate(self) -> None:
+        """Forget every file whose device, inode, size or mtime changed since it was hashed.
+
+        An event names one path, but a write through a hard link changes
+        every name of the file, and lost events name nothing at all.
+        """
+        with self.lock:
+            self.forget([path for path, stamp in self.stamps.items() if file_stamp(path) != stamp])
+
+    def digest(self, path: ReleasePath) -> str | None:
+        self.collect([(path, ())], parse=False)
+        identified = self.digests.get(path)
+        return None if identified is None or isinstance(identified, PdfFactsError) else identified[0]
+
+    def facts(self, path: ReleasePath, fragments: tuple[str, ...] = ()) -> PdfFacts:
+        """Facts whose text is complete enough to decide every fragment."""
+        self.collect([(path, fragments)])
+        identified = self.digests[path]
+        if isinstance(identified, PdfFactsError):
+            raise identified
+        digest, byte_count = identified
+        parsed = self.texts[digest]
+        if isinstance(parsed, PdfFactsError):
+            raise parsed
+        page_count, text, scanned = parsed
+        if scanned < page_count and not all(fragment in text for fragment in fragments):
+            # A fragment is missing from the pages seen so far: extract the whole document.
+            with self.lock:
+                if self.texts[digest] is parsed:
+                    self.parsed(digest, byte_count, self.sandbox.parse(path))
+            return self.facts(path, fragments)
+        return digest, byte_count, page_count, text
+
+    def close(self) -> None:
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+
 
+def standard_pdfs(standard: dict[str, Any], args: argparse.Namespace) -> list[tuple[ReleasePath, tuple[str, ...]]]:
+    """List the PDFs checked for one standard, with its identity fragments, in check order."""
+    fragments = identity_fragments(standard)
+    pdfs = [(args.records_dir / standard["record_filename"], fragments)]
+    alias = standard.get("canonical_alias_filename")
+    if alias:
+        pdfs.append((args.records_dir / alias, fragments))
+    canonical_document = standard.get("canonical_document")
+    if canonical_document:
+        pdfs.append((args.canonical_dir / canonical_document, fragments))
+    if args.machine_dir:
+        pdfs.append((args.machine_dir / "artifacts" / f"{standard['canonical_id']}.pdf", fragments))
+    return pdfs
+
+
+def release_pdfs(standards: list[dict[str, Any]], args: argparse.Namespace) -> list[tuple[ReleasePath, tuple[str, ...]]]:
+    return [pdf for standard in standards for pdf in standard_pdfs(standard, args)]
+
+
+WEB_TOKEN = re.compile(
+    r"""
+    (?P<key>[A-Za-z_$][\w$]*)\s*:\s*(?P<value>
+        "(?:[^"\\\n]|\\.)*" | '(?:[^'\\\n]|\\.)*' | `[^`$]*`
+      | -?\d[\d_]*(?:\.\d+)? | null | true | false
+    )
+  | (?P<string>"(?:[^"\\\n]|\\.)*" | '(?:[^'\\\n]|\\.)*')
+    """,
+    re.VERBOSE,
+)
+
+WebFields = dict[str, list[Any]]
+
+
+def web_literal(token: str) -> Any:
+    if token[0] == '"':
+        try:
+            return json.loads(token)
+        except ValueError:
+            return token[1:-1]
+    if token[0] in "'`":
+        return token[1:-1].replace("\\'", "'")
+    if token in ("null", "true", "false"):
+        return {"null": None, "true": True, "false": False}[token]
+    number = token.replace("_", "")
+    return float(number) if "." in number else int(number)
+
+
+def parse_web_registry(source: str) -> dict[str, WebFields]:
+    """Index lib/registry.ts by canonical ID in a single pass.
+
+    A standard's block runs from its `canonical_id: "..."` field to the next
+    `schema_version: "1.0"` or canonical ID. Each key maps to its values in
+    source order; string literals outside a key/value pair, such as array
+    items, are collected under the empty key. The first block for an ID wins.
+    """
+    entries: dict[str, WebFields] = {}
+    fields: WebFields | None = None
+    for match in WEB_TOKEN.finditer(source):
+        if match["string"] is not None:
+            if fields is not None:
+                fields.setdefault("", []).append(web_literal(match["string"]))
+            continue
+        key, value = match["key"], web_literal(match["value"])
+        if key == "canonical_id" and isinstance(value, str):
+            fields = {key: [value]}
+            entries.setdefault(value, fields)
+        elif key == "schema_version" and value == "1.0":
+            fields = None
+        elif fields is not None:
+            fields.setdefault(key, []).append(value)
+    return entries
 
-def check_pdf(gate: Gate, standard: dict[str, Any], path: Path, label: str) -> None:
+
+TEXT_EXCERPT_CHARS = 200
+SIGNED_HASH = re.compile(r"sha256:[0-9a-fA-F]{64}")
+
+
+def check_pdf(
+    gate: Gate,
+    standard: dict[str, Any],
+    path: ReleasePath,
+    label: str,
+    files: ReleaseFiles,
+) -> None:
     canonical_id = standard["canonical_id"]
     if not path.exists():
-        gate.failed(f"{canonical_id} {label} missing: {path}")
+        gate.failed(f"{canonical_id} {label} missing: {path}", str(path), None, f"{canonical_id} {label} present")
         return
     try:
-        digest, byte_count, page_count, text = pdf_facts(path)
+        digest, byte_count, page_count, text = files.facts(path, identity_fragments(standard))
+    except PdfParseLimit as error:  # fail closed; the sandbox gave up on this PDF
+        gate.failed(
+            f"{canonical_id} {label} parse limit: {error}",
+            "parsed within the sandbox limits",
+            str(error),
+            f"{canonical_id} {label} parse limit",
+        )
+        return
     except Exception as error:  # fail closed on malformed PDFs
-        gate.failed(f"{canonical_id} {label} unreadable: {error}")
+        gate.failed(
+            f"{canonical_id} {label} unreadable: {error}", "a readable PDF", str(error), f"{canonical_id} {label} readable"
+        )
         return
     gate.equal(digest, standard["sha256"], f"{canonical_id} {label} SHA-256")
     gate.equal(byte_count, standard["bytes"], f"{canonical_id} {label} bytes")
     gate.equal(page_count, standard["pages"], f"{canonical_id} {label} pages")
+    # The text is the report's actual value only where a fragment is missing; an excerpt is enough to see why.
+    excerpt = text[:TEXT_EXCERPT_CHARS]
     for required in standard["pdf_identity"]["required_text"]:
-        if normalize_text(required) in text:
-            gate.passed(f"{canonical_id} PDF contains {required!r}")
+        fragment = normalize_text(required)
+        name = f"{canonical_id} {label} identity text {required!r}"
+        if fragment in text:
+            gate.passed(f"{canonical_id} PDF contains {required!r}", fragment, fragment, name)
         else:
-            gate.failed(f"{canonical_id} PDF missing required identity text {required!r}")
+            gate.failed(f"{canonical_id} PDF missing required identity text {required!r}", fragment, excerpt, name)
     if standard["pdf_identity"]["mode"] == "canonical_id_and_title":
+        name = f"{canonical_id} {label} canonical ID text"
         if canonical_id in text:
-            gate.passed(f"{canonical_id} PDF contains canonical ID")
+            gate.passed(f"{canonical_id} PDF contains canonical ID", canonical_id, canonical_id, name)
         else:
-            gate.failed(f"{canonical_id} PDF does not contain canonical ID")
+            gate.failed(f"{canonical_id} PDF does not contain canonical ID", canonical_id, excerpt, name)
 
 
-def check_signature(gate: Gate, standard: dict[str, Any], canonical_dir: Path) -> None:
+def check_signature(gate: Gate, standard: dict[str, Any], canonical_dir: ReleasePath) -> None:
     signature = standard.get("signature")
     if not signature:
         return
     path = canonical_dir / signature
+    name = f"{standard['canonical_id']} signed hash"
+    expected = f"sha256:{standard['sha256']}"
     if not path.exists():
-        gate.failed(f"{standard['canonical_id']} signature missing: {path}")
+        gate.failed(f"{standard['canonical_id']} signature missing: {path}", expected, None, name)
         return
     content = path.read_text(encoding="utf-8")
-    expected = f"sha256:{standard['sha256']}"
     if expected in content:
-        gate.passed(f"{standard['canonical_id']} signed hash")
+        gate.passed(name, expected, expected, name)
     else:
-        gate.failed(f"{standard['canonical_id']} signature does not contain {expected}")
+        gate.failed(
+            f"{standard['canonical_id']} signature does not contain {expected}", expected, SIGNED_HASH.findall(content), name
+        )
 
 
 def check_canonical_registry(
@@ -111,7 +1255,12 @@ def check_canonical_registry(
     canonical_id = standard["canonical_id"]
     record = registry_by_id.get(canonical_id)
     if record is None:
-        gate.failed(f"{canonical_id} absent from Canonical Archive registry")
+        gate.failed(
+            f"{canonical_id} absent from Canonical Archive registry",
+            canonical_id,
+            None,
+            f"{canonical_id} canonical registry entry",
+        )
         return
     for key in ("version", "status", "title"):
         gate.equal(record.get(key), standard[key], f"{canonical_id} canonical registry {key}")
@@ -122,190 +1271,964 @@ def check_canonical_registry(
     )
 
 
-def check_web_source(gate: Gate, standard: dict[str, Any], source: str) -> None:
+def check_web_field(gate: Gate, canonical_id: str, fields: WebFields, key: str, expected: Any, label: str) -> None:
+    values = fields.get(key, [])
+    name = f"{canonical_id} web source {label}"
+    if expected in values:
+        gate.passed(name, expected, expected, name)
+    elif values:
+        gate.failed(
+            f"{canonical_id} web source {label}: expected {key} {expected!r}, got {values[0]!r}", expected, values[0], name
+        )
+    else:
+        gate.failed(f"{canonical_id} web source missing {label}: no {key} field", expected, None, name)
+
+
+def check_web_source(gate: Gate, standard: dict[str, Any], web_entries: dict[str, WebFields]) -> None:
     canonical_id = standard["canonical_id"]
-    block = standard_block(source, canonical_id)
-    if block is None:
-        gate.failed(f"{canonical_id} absent from RuleMark Web source registry")
+    fields = web_entries.get(canonical_id)
+    if fields is None:
+        gate.failed(
+            f"{canonical_id} absent from RuleMark Web source registry", canonical_id, None, f"{canonical_id} web source entry"
+        )
         return
-    expected_fragments = {
-        "version": f'version: "{standard["version"]}"',
-        "title": f'title: "{standard["title"]}"',
-        "SHA-256": f'sha256: "{standard["sha256"]}"',
-        "bytes": f'bytes: {standard["bytes"]}',
-        "record filename": standard["record_filename"],
-        "citation": f'citation: "{standard["citation"]}"',
-    }
-    for label, fragment in expected_fragments.items():
-        if fragment in block:
-            gate.passed(f"{canonical_id} web source {label}")
-        else:
-            gate.failed(f"{canonical_id} web source missing {label}: {fragment}")
-    issued_at = standard.get("registry_issued_at")
-    expected_date = f'issued_at: "{issued_at}"' if issued_at else "issued_at: null"
-    if expected_date in block:
-        gate.passed(f"{canonical_id} web source registry issue date")
+    check_web_field(gate, canonical_id, fields, "version", standard["version"], "version")
+    check_web_field(gate, canonical_id, fields, "title", standard["title"], "title")
+    check_web_field(gate, canonical_id, fields, "sha256", standard["sha256"], "SHA-256")
+    check_web_field(gate, canonical_id, fields, "bytes", standard["bytes"], "bytes")
+    record_filename = standard["record_filename"]
+    name = f"{canonical_id} web source record filename"
+    if any(isinstance(value, str) and record_filename in value for values in fields.values() for value in values):
+        gate.passed(name, record_filename, record_filename, name)
     else:
-        gate.failed(f"{canonical_id} web source missing registry issue date {expected_date}")
+        record = fields.get("record", [None])[0]
+        gate.failed(f"{canonical_id} web source missing record filename: {record_filename}", record_filename, record, name)
+    check_web_field(gate, canonical_id, fields, "citation", standard["citation"], "citation")
+    issued_at = standard.get("registry_issued_at") or None
+    check_web_field(gate, canonical_id, fields, "issued_at", issued_at, "registry issue date")
 
 
-def fetch_bytes(url: str) -> bytes:
+USER_AGENT = "RuleMark-Integrity-Gate/1.0"
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class DownloadTooLarge(RuntimeError):
+    """A download announced or delivered more bytes than the baseline allows."""
+
+
+class Response(Protocol):
+    """What consumers read from a response: a live HTTPResponse or a FixtureResponse."""
+
+    status: int
+
+    def getheader(self, name: str, /) -> str | None: ...
+
+    def read(self, size: int = ..., /) -> bytes: ...
+
+
+def read_body(response: Response) -> bytes:
+    return response.read()
+
+
+def stream_digest(response: Response, limit: int) -> tuple[str, int]:
+    """Hash and count a response body as it arrives, aborting past limit bytes."""
+    length = response.getheader("Content-Length")
+    if length is not None and length.isdigit() and int(length) > limit:
+        raise DownloadTooLarge(f"Content-Length {length} exceeds expected {limit} bytes")
+    digest = hashlib.sha256()
+    count = 0
+    while chunk := response.read(DOWNLOAD_CHUNK_BYTES):
+        count += len(chunk)
+        if count > limit:
+            raise DownloadTooLarge(f"received more than expected {limit} bytes")
+        digest.update(chunk)
+    return digest.hexdigest(), count
+
+
+def cache_busted(url: str) -> str:
     separator = "&" if "?" in url else "?"
-    cache_busted = f"{url}{separator}integrity_gate={int(time.time())}"
-    request = urllib.request.Request(cache_busted, headers={"User-Agent": "RuleMark-Integrity-Gate/1.0"})
-    with urllib.request.urlopen(request, timeout=30) as response:
-        if response.status != 200:
-            raise RuntimeError(f"HTTP {response.status} for {url}")
-        return response.read()
+    return f"{url}{separator}integrity_gate={int(time.time())}"
+
+
+def fixture_key(url: str) -> str:
+    """Host, path and query of a URL, without its scheme or cache-busting parameter."""
+    parts = urllib.parse.urlsplit(url)
+    query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True) if name != "integrity_gate"]
+    key = f"{parts.netloc}{parts.path or '/'}"
+    return f"{key}?{urllib.parse.urlencode(query)}" if query else key
+
+
+class FixtureResponse:
+    """A recorded response, read like the http.client.HTTPResponse it stands in for."""
+
+    will_close = False
+
+    def __init__(self, status: int, location: str | None, body: bytes) -> None:
+        self.status = status
+        self.headers = {"Content-Length": str(len(body))}
+        if location is not None:
+            self.headers["Location"] = location
+        self.body = io.BytesIO(body)
+
+    def getheader(self, name: str, default: str | None = None) -> str | None:
+        return self.headers.get(name, default)
+
+    def read(self, size: int = -1) -> bytes:
+        return self.body.read(size)
+
+
+class FixtureStore:
+    """Content-addressed store of online responses for offline runs.
+
+    index.json maps each fixture_key() to its status, redirect location and
+    body digest; bodies live once each under objects/ by SHA-256, so the
+    same PDF served from several URLs is stored once.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        index = path / "index.json"
+        self.fixtures: dict[str, dict[str, Any]] = load_json(index)["fixtures"] if index.exists() else {}
+
+    def object_path(self, digest: str) -> Path:
+        return self.path / "objects" / digest[:2] / digest[2:]
+
+    def record(self, url: str, status: int, location: str | None, body: bytes) -> FixtureResponse:
+        digest = sha256_bytes(body)
+        target = self.object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            temporary = target.with_name(f"{target.name}.{threading.get_ident()}.tmp")
+            temporary.write_bytes(body)
+            temporary.replace(target)
+        key = fixture_key(url)
+        with self.lock:
+            self.fixtures[key] = {
+                "url": f"{urllib.parse.urlsplit(url).scheme}://{key}",
+                "status": status,
+                "location": location,
+                "sha256": digest,
+            }
+        return FixtureResponse(status, location, body)
+
+    def response(self, url: str) -> FixtureResponse:
+        fixture = self.fixtures.get(fixture_key(url))
+        if fixture is None:
+            raise RuntimeError(f"no recorded fixture for {url}")
+        return FixtureResponse(fixture["status"], fixture["location"], self.object_path(fixture["sha256"]).read_bytes())
+
+    def save(self) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        temporary = self.path / "index.json.tmp"
+        with self.lock:
+            index = {"fixtures": dict(sorted(self.fixtures.items()))}
+        temporary.write_text(json.dumps(index, indent=2) + "\n", encoding="utf-8")
+        temporary.replace(self.path / "index.json")
+
+
+class Fetcher:
+    """Concurrent HTTP(S) fetches for the online checks.
+
+    Requests run on a thread pool, at most per_host at a time against any one
+    host, over keep-alive connections that are returned to a per-host pool.
+    Each distinct URL is fetched once per run; repeated requests share the
+    same future. Bodies are either buffered (get) or hashed as they stream
+    in (get_digest), so large downloads never sit in memory.
+
+    With a FixtureStore the fetcher either records every live response into
+    it or, when replaying, answers from it after latency seconds without
+    touching the network. With a fixture server every connection goes to
+    that address instead, keeping the original Host header.
+    """
+
+    def __init__(
+        self,
+        workers: int = 8,
+        per_host: int = 4,
+        timeout: float = 30,
+        fixtures: FixtureStore | None = None,
+        replay: bool = False,
+        latency: float = 0.0,
+        server: tuple[str, int] | None = None,
+    ) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="integrity-fetch")
+        self.per_host = per_host
+        self.timeout = timeout
+        self.fixtures = fixtures
+        self.replay = replay
+        self.latency = latency
+        self.server = server
+        self.lock = threading.Lock()
+        self.futures: dict[tuple[Any, ...], Future[Any]] = {}
+        self.slots: dict[tuple[str, str, int], threading.BoundedSemaphore] = {}
+        self.idle: dict[tuple[str, str, int], list[http.client.HTTPConnection]] = {}
+
+    def __enter__(self) -> Fetcher:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def submit(self, key: tuple[Any, ...], url: str, consume: Callable[[Response], Any]) -> Future[Any]:
+        with self.lock:
+            future = self.futures.get(key)
+            if future is None:
+                future = self.futures[key] = self.executor.submit(self.download, url, consume)
+            return future
+
+    def get(self, url: str) -> Future[bytes]:
+        return self.submit(("bytes", url), url, read_body)
+
+    def get_digest(self, url: str, limit: int) -> Future[tuple[str, int]]:
+        return self.submit(("sha256", url, limit), url, lambda response: stream_digest(response, limit))
+
+    def fetch_bytes(self, url: str) -> bytes:
+        return self.get(url).result()
+
+    def fetch_json(self, url: str) -> dict[str, Any]:
+        return json.loads(self.fetch_bytes(url).decode("utf-8"))
+
+    def download(self, url: str, consume: Callable[[Response], Any]) -> Any:
+        target = cache_busted(url)
+        for _ in range(MAX_REDIRECTS + 1):
+            status, location, body = self.request(target, consume)
+            if status in REDIRECT_STATUSES and location:
+                target = urllib.parse.urljoin(target, location)
+                continue
+            if status != 200:
+                raise RuntimeError(f"HTTP {status} for {url}")
+            return body
+        raise RuntimeError(f"too many redirects for {url}")
+
+    def request(
+        self, url: str, consume: Callable[[Response], Any]
+    ) -> tuple[int, str | None, Any]:
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL: {url}")
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = urllib.parse.urlunsplit(("", "", parts.path or "/", parts.query, ""))
+        headers = {"User-Agent": USER_AGENT, "Host": parts.netloc}
+        with self.slot(key):
+            if self.replay and self.fixtures is not None:
+                # Held inside the per-host slot, so injected latency queues like a real server's.
+                time.sleep(self.latency)
+                fixture = self.fixtures.response(url)
+                body = consume(fixture) if fixture.status == 200 else fixture.read()
+                return fixture.status, fixture.getheader("Location"), body
+            connection, reused = self.checkout(key)
+            try:
+                response, body = self.exchange(connection, url, target, headers, consume)
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused:
+                    raise
+                # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                connection = self.connect(key)
+                try:
+                    response, body = self.exchange(connection, url, target, headers, consume)
+                except BaseException:
+                    connection.close()
+                    raise
+            except BaseException:
+                # Includes an aborted download: the unread body makes the connection unusable.
+                connection.close()
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self.checkin(key, connection)
+            return response.status, response.getheader("Location"), body
+
+    def exchange(
+        self,
+        connection: http.client.HTTPConnection,
+        url: str,
+        target: str,
+        headers: dict[str, str],
+        consume: Callable[[Response], Any],
+    ) -> tuple[http.client.HTTPResponse, Any]:
+        connection.request("GET", target, headers=headers)
+        response = connection.getresponse()
+        if self.fixtures is None:
+            return response, consume(response) if response.status == 200 else response.read()
+        # Recording buffers the body so it can be stored before it is consumed.
+        data = response.read()
+        recorded = self.fixtures.record(url, response.status, response.getheader("Location"), data)
+        return response, consume(recorded) if response.status == 200 else data
+
+    def slot(self, key: tuple[str, str, int]) -> threading.BoundedSemaphore:
+        with self.lock:
+            if key not in self.slots:
+                self.slots[key] = threading.BoundedSemaphore(self.per_host)
+            return self.slots[key]
+
+    def connect(self, key: tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if self.server is not None:
+            return http.client.HTTPConnection(*self.server, timeout=self.timeout)
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=ssl.create_default_context())
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def checkout(self, key: tuple[str, str, int]) -> tuple[http.client.HTTPConnection, bool]:
+        with self.lock:
+            idle = self.idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self.connect(key), False
+
+    def checkin(self, key: tuple[str, str, int], connection: http.client.HTTPConnection) -> None:
+        with self.lock:
+            self.idle.setdefault(key, []).append(connection)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        with self.lock:
+            for connections in self.idle.values():
+                for connection in connections:
+                    connection.close()
+            self.idle.clear()
+        if self.fixtures is not None and not self.replay:
+            self.fixtures.save()
 
 
-def fetch_json(url: str) -> dict[str, Any]:
-    return json.loads(fetch_bytes(url).decode("utf-8"))
+def prefetch_signature(fetcher: Fetcher, machine: Future[bytes]) -> None:
+    # Start the signature download as soon as its Machine JSON arrives.
+    try:
+        signature_url = json.loads(machine.result().decode("utf-8"))["artifacts"]["pdf"].get("signature_url")
+        if signature_url:
+            fetcher.get(signature_url)
+    except Exception:
+        pass  # check_online reports the failure in baseline order
 
 
-def check_online(gate: Gate, standards: list[dict[str, Any]], base_url: str) -> None:
+def check_online(gate: Gate, standards: list[dict[str, Any]], base_url: str, fetcher: Fetcher) -> None:
+    registry_url = f"{base_url}/registry/v1/standards.json"
     try:
-        registry = fetch_json(f"{base_url}/registry/v1/standards.json")
+        registry = fetcher.fetch_json(registry_url)
         registry_by_id = {item["canonical_id"]: item for item in registry["standards"]}
     except Exception as error:
-        gate.failed(f"online Registry JSON unavailable: {error}")
+        gate.failed(f"online Registry JSON unavailable: {error}", registry_url, str(error), "online Registry JSON")
         return
 
+    # Issue every request up front; results are then checked in baseline order.
     for standard in standards:
         canonical_id = standard["canonical_id"]
-        online_registry = registry_by_id.get(canonical_id)
-        if online_registry is None:
-            gate.failed(f"{canonical_id} absent from online Registry JSON")
-        else:
-            gate.equal(online_registry.get("standard_version"), standard["version"], f"{canonical_id} online registry version")
-            gate.equal(online_registry.get("title"), standard["title"], f"{canonical_id} online registry title")
-            gate.equal(online_registry.get("pdf_sha256"), standard["sha256"], f"{canonical_id} online registry SHA-256")
+        machine = fetcher.get(f"{base_url}/m/v1/standards/{canonical_id}/versions/{standard['version']}.json")
+        machine.add_done_callback(lambda future: prefetch_signature(fetcher, future))
+        fetcher.get_digest(standard["canonical_file_url"], standard["bytes"])
+        fetcher.get(f"{base_url}/standards/{canonical_id}")
 
-        machine_url = f"{base_url}/m/v1/standards/{canonical_id}/versions/{standard['version']}.json"
-        try:
-            machine = fetch_json(machine_url)
-            pdf = machine.get("artifacts", {}).get("pdf", {})
-            gate.equal(machine.get("version"), standard["version"], f"{canonical_id} online machine version")
-            gate.equal(machine.get("title"), standard["title"], f"{canonical_id} online machine title")
-            gate.equal(machine.get("citation"), standard["citation"], f"{canonical_id} online machine citation")
-            gate.equal(pdf.get("sha256"), standard["sha256"], f"{canonical_id} online machine SHA-256")
-            gate.equal(pdf.get("bytes"), standard["bytes"], f"{canonical_id} online machine bytes")
-            gate.equal(pdf.get("url"), standard["canonical_file_url"], f"{canonical_id} online machine PDF URL")
-            signature_url = pdf.get("signature_url")
-            if signature_url:
-                signature = fetch_bytes(signature_url).decode("utf-8", errors="replace")
-                if f"sha256:{standard['sha256']}" in signature:
-                    gate.passed(f"{canonical_id} online signature hash")
+    for standard in standards:
+        canonical_id = standard["canonical_id"]
+        with gate.scope("online", canonical_id):
+            online_registry = registry_by_id.get(canonical_id)
+            if online_registry is None:
+                gate.failed(
+                    f"{canonical_id} absent from online Registry JSON",
+                    canonical_id,
+                    None,
+                    f"{canonical_id} online registry entry",
+                )
+            else:
+                gate.equal(online_registry.get("standard_version"), standard["version"], f"{canonical_id} online registry version")
+                gate.equal(online_registry.get("title"), standard["title"], f"{canonical_id} online registry title")
+                gate.equal(online_registry.get("pdf_sha256"), standard["sha256"], f"{canonical_id} online registry SHA-256")
+
+            machine_url = f"{base_url}/m/v1/standards/{canonical_id}/versions/{standard['version']}.json"
+            try:
+                record = fetcher.fetch_json(machine_url)
+                pdf = record.get("artifacts", {}).get("pdf", {})
+                gate.equal(record.get("version"), standard["version"], f"{canonical_id} online machine version")
+                gate.equal(record.get("title"), standard["title"], f"{canonical_id} online machine title")
+                gate.equal(record.get("citation"), standard["citation"], f"{canonical_id} online machine citation")
+                gate.equal(pdf.get("sha256"), standard["sha256"], f"{canonical_id} online machine SHA-256")
+                gate.equal(pdf.get("bytes"), standard["bytes"], f"{canonical_id} online machine bytes")
+                gate.equal(pdf.get("url"), standard["canonical_file_url"], f"{canonical_id} online machine PDF URL")
+                signature_url = pdf.get("signature_url")
+                if signature_url:
+                    signature = fetcher.fetch_bytes(signature_url).decode("utf-8", errors="replace")
+                    name, expected = f"{canonical_id} online signature hash", f"sha256:{standard['sha256']}"
+                    if expected in signature:
+                        gate.passed(name, expected, expected, name)
+                    else:
+                        gate.failed(
+                            f"{canonical_id} online signature does not match normative artifact",
+                            expected,
+                            SIGNED_HASH.findall(signature),
+                            name,
+                        )
+            except Exception as error:
+                gate.failed(
+                    f"{canonical_id} online Machine JSON unavailable: {error}",
+                    machine_url,
+                    str(error),
+                    f"{canonical_id} online Machine JSON",
+                )
+
+            try:
+                digest, byte_count = fetcher.get_digest(standard["canonical_file_url"], standard["bytes"]).result()
+                gate.equal(digest, standard["sha256"], f"{canonical_id} online download SHA-256")
+                gate.equal(byte_count, standard["bytes"], f"{canonical_id} online download bytes")
+            except DownloadTooLarge as error:
+                gate.failed(
+                    f"{canonical_id} online download bytes: {error}",
+                    standard["bytes"],
+                    str(error),
+                    f"{canonical_id} online download bytes",
+                )
+            except Exception as error:
+                gate.failed(
+                    f"{canonical_id} online download unavailable: {error}",
+                    standard["canonical_file_url"],
+                    str(error),
+                    f"{canonical_id} online download",
+                )
+
+            detail_url = f"{base_url}/standards/{canonical_id}"
+            try:
+                detail = fetcher.fetch_bytes(detail_url).decode("utf-8", errors="replace")
+                name = f"{canonical_id} human page integrity metadata"
+                metadata = [standard["sha256"], f"{standard['bytes']:,}"]
+                shown = [value for value in metadata if value in detail]
+                if shown == metadata:
+                    gate.passed(name, metadata, shown, name)
                 else:
-                    gate.failed(f"{canonical_id} online signature does not match normative artifact")
-        except Exception as error:
-            gate.failed(f"{canonical_id} online Machine JSON unavailable: {error}")
+                    gate.failed(f"{canonical_id} human page does not expose expected hash and bytes", metadata, shown, name)
+            except Exception as error:
+                gate.failed(
+                    f"{canonical_id} human page unavailable: {error}", detail_url, str(error), f"{canonical_id} human page"
+                )
 
-        try:
-            pdf_data = fetch_bytes(standard["canonical_file_url"])
-            gate.equal(sha256_bytes(pdf_data), standard["sha256"], f"{canonical_id} online download SHA-256")
-            gate.equal(len(pdf_data), standard["bytes"], f"{canonical_id} online download bytes")
-        except Exception as error:
-            gate.failed(f"{canonical_id} online download unavailable: {error}")
 
-        try:
-            detail = fetch_bytes(f"{base_url}/standards/{canonical_id}").decode("utf-8", errors="replace")
-            if standard["sha256"] in detail and f"{standard['bytes']:,}" in detail:
-                gate.passed(f"{canonical_id} human page integrity metadata")
-            else:
-                gate.failed(f"{canonical_id} human page does not expose expected hash and bytes")
-        except Exception as error:
-            gate.failed(f"{canonical_id} human page unavailable: {error}")
+def check_standard(
+    gate: Gate,
+    standard: dict[str, Any],
+    args: argparse.Namespace,
+    files: ReleaseFiles,
+    canonical_by_id: dict[str, dict[str, Any]],
+    web_entries: dict[str, WebFields] | None,
+    machine_by_id: dict[str, dict[str, Any]] | None,
+) -> None:
+    canonical_id = standard["canonical_id"]
+    record_path = args.records_dir / standard["record_filename"]
+    with gate.scope("pdf", canonical_id):
+        check_pdf(gate, standard, record_path, "Records PDF", files)
+
+    alias = standard.get("canonical_alias_filename")
+    if alias:
+        alias_path = args.records_dir / alias
+        with gate.scope("pdf", canonical_id):
+            check_pdf(gate, standard, alias_path, "canonical-ID alias", files)
+        if record_path.exists() and alias_path.exists():
+            with gate.scope("alias", canonical_id):
+                label = f"{canonical_id} legacy filename alias bytes"
+                record_digest, alias_digest = files.digest(record_path), files.digest(alias_path)
+                if record_digest is None or alias_digest is None:
+                    pass  # check_pdf has already failed the PDF that cannot be read
+                elif record_digest == alias_digest:
+                    gate.passed(label, record_digest, alias_digest, label)
+                else:
+                    # Mismatches are rare; report them exactly as a byte comparison would.
+                    gate.equal(record_path.read_bytes(), alias_path.read_bytes(), label)
+
+    canonical_document = standard.get("canonical_document")
+    if canonical_document:
+        with gate.scope("pdf", canonical_id):
+            check_pdf(gate, standard, args.canonical_dir / canonical_document, "Canonical Archive PDF", files)
+    with gate.scope("signature", canonical_id):
+        check_signature(gate, standard, args.canonical_dir)
+    with gate.scope("canonical_registry", canonical_id):
+        check_canonical_registry(gate, standard, canonical_by_id)
+    if web_entries is not None:
+        with gate.scope("web_source", canonical_id):
+            check_web_source(gate, standard, web_entries)
+    if args.machine_dir:
+        machine_artifact = args.machine_dir / "artifacts" / f"{canonical_id}.pdf"
+        if machine_artifact.exists():
+            with gate.scope("pdf", canonical_id):
+                check_pdf(gate, standard, machine_artifact, "Machine Interface artifact", files)
+        if machine_by_id is not None:
+            with gate.scope("machine_mirror", canonical_id):
+                mirror = machine_by_id.get(canonical_id)
+                if mirror is None:
+                    gate.failed(
+                        f"{canonical_id} absent from Machine Interface derived registry",
+                        canonical_id,
+                        None,
+                        f"{canonical_id} machine mirror entry",
+                    )
+                else:
+                    gate.equal(mirror.get("version"), standard["version"], f"{canonical_id} machine mirror version")
+                    gate.equal(mirror.get("status"), standard["status"], f"{canonical_id} machine mirror status")
+
+
+@functools.lru_cache(maxsize=None)
+def gate_fingerprint() -> str:
+    # A changed gate must re-verify everything, so its own source is part of the state.
+    return sha256_bytes(Path(__file__).read_bytes())
+
+
+def standard_input_digest(
+    standard: dict[str, Any],
+    args: argparse.Namespace,
+    files: ReleaseFiles,
+    canonical_by_id: dict[str, dict[str, Any]],
+    web_entries: dict[str, WebFields] | None,
+    machine_by_id: dict[str, dict[str, Any]] | None,
+) -> str:
+    """Digest every input that check_standard reads for one standard."""
+    canonical_id = standard["canonical_id"]
+    signature = standard.get("signature")
+    signature_path = args.canonical_dir / signature if signature else None
+    inputs = {
+        "baseline": standard,
+        "pdfs": [[str(path), files.digest(path)] for path, _ in standard_pdfs(standard, args)],
+        "signature": (
+            sha256_bytes(signature_path.read_bytes()) if signature_path is not None and signature_path.exists() else None
+        ),
+        "canonical_registry": canonical_by_id.get(canonical_id),
+        "web": web_entries.get(canonical_id) if web_entries is not None else "unchecked",
+        "machine_registry": machine_by_id.get(canonical_id) if machine_by_id is not None else "unchecked",
+    }
+    return sha256_bytes(json.dumps(inputs, sort_keys=True).encode("utf-8"))
+
+
+def default_state_path() -> Path:
+    return default_cache_path().parent / "gate-state.json"
+
+
+def load_gate_state(path: Path) -> dict[str, str]:
+    try:
+        state = load_json(path)
+    except (OSError, ValueError):
+        return {}
+    if state.get("gate") != gate_fingerprint():
+        return {}
+    return dict(state.get("standards", {}))
+
+
+def save_gate_state(path: Path, standards: dict[str, str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + ".tmp")
+    state = {"gate": gate_fingerprint(), "standards": standards}
+    temporary.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    temporary.replace(path)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a positive integer, got {value}")
+    return number
+
+
+def host_port(value: str) -> tuple[str, int]:
+    host, _, port = value.rpartition(":")
+    if not host or not port.isdigit():
+        raise argparse.ArgumentTypeError(f"expected HOST:PORT, got {value}")
+    return host, int(port)
+
+
+def shard_spec(value: str) -> tuple[int, int]:
+    index, _, count = value.partition("/")
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a shard as I/N, got {value}") from None
+    if not 1 <= shard[0] <= shard[1]:
+        raise argparse.ArgumentTypeError(f"expected a shard as I/N with 1 <= I <= N, got {value}")
+    return shard
+
+
+def shard_of(canonical_id: str, count: int) -> int:
+    # Hashing the ID keeps a standard on the same shard however the baseline is reordered.
+    return int(sha256_bytes(canonical_id.encode("utf-8")), 16) % count + 1
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
-    parser.add_argument("--canonical-dir", type=Path, required=True)
-    parser.add_argument("--records-dir", type=Path, required=True)
-    parser.add_argument("--web-dir", type=Path)
-    parser.add_argument("--machine-dir", type=Path)
+    parser.add_argument("--canonical-dir", required=True)
+    parser.add_argument("--records-dir")
+    parser.add_argument("--web-dir")
+    parser.add_argument("--machine-dir")
     parser.add_argument("--online", action="store_true")
     parser.add_argument("--base-url", default="https://rulemark.org")
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=positive_int,
+        default=1,
+        help="parse PDFs in N worker processes and check standards on N threads (default: 1, serial)",
+    )
+    parser.add_argument(
+        "--pdf-cpu-seconds",
+        type=positive_int,
+        default=60,
+        help="CPU-time budget for parsing one PDF; the wall-clock limit is four times this (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--pdf-memory-mb",
+        type=positive_int,
+        default=2048,
+        help="address-space limit of the process parsing one PDF (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache",
+        type=Path,
+        default=default_cache_path(),
+        help="PDF facts cache file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=positive_int,
+        default=256,
+        help="evict least recently used PDF facts above this size (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="hash and parse every PDF from scratch; use for release builds",
+    )
+    parser.add_argument(
+        "--online-workers",
+        type=positive_int,
+        default=8,
+        help="concurrent online requests (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--per-host",
+        type=positive_int,
+        default=4,
+        help="concurrent online requests per host (default: %(default)s)",
+    )
+    fixtures = parser.add_mutually_exclusive_group()
+    fixtures.add_argument(
+        "--record-fixtures",
+        type=Path,
+        metavar="DIR",
+        help="record every online response into a fixture store for offline replay",
+    )
+    fixtures.add_argument(
+        "--replay-fixtures",
+        type=Path,
+        metavar="DIR",
+        help="answer online requests from a fixture store instead of the network",
+    )
+    fixtures.add_argument(
+        "--fixture-server",
+        type=host_port,
+        metavar="HOST:PORT",
+        help="send every online request to a local fixture server (scripts/fixture_server.py)",
+    )
+    parser.add_argument(
+        "--replay-latency-ms",
+        type=int,
+        default=0,
+        help="latency injected into each replayed request (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="skip standards whose inputs are unchanged since they last passed",
+    )
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=default_state_path(),
+        help="input digests of passing standards for --incremental (default: %(default)s)",
+    )
+    parser.add_argument("--report", type=Path, help="write a JSON report with one entry per check")
+    parser.add_argument("--junit", type=Path, help="write a JUnit XML report with one test case per check")
+    parser.add_argument(
+        "--shard",
+        type=shard_spec,
+        metavar="I/N",
+        help="check only the standards in shard I of N; release-wide checks run in --merge-reports",
+    )
+    parser.add_argument(
+        "--merge-reports",
+        type=Path,
+        nargs="+",
+        metavar="REPORT",
+        help="combine the JSON reports of every --shard run and run the release-wide checks once",
+    )
+    parser.add_argument(
+        "--sweep-tags",
+        metavar="PATTERN",
+        help="verify every tag of the --canonical-dir repository matching PATTERN, in version order; "
+        "sources given as REPOSITORY@REF have {tag} in REF replaced by each tag",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and re-verify the standards whose files change (inotify, or stat polling)",
+    )
+    args = parser.parse_args()
+    if args.watch and (args.online or args.incremental or args.shard or args.merge_reports or args.sweep_tags):
+        parser.error("--watch cannot be combined with --online, --incremental, --shard, --merge-reports or --sweep-tags")
+    if args.merge_reports and args.shard:
+        parser.error("--merge-reports cannot be combined with --shard")
+    if not args.merge_reports and args.records_dir is None:
+        parser.error("the following arguments are required: --records-dir")
+    if args.sweep_tags is not None:
+        if args.merge_reports or args.incremental:
+            parser.error("--sweep-tags cannot be combined with --merge-reports or --incremental")
+        if "{tag}" not in args.canonical_dir.rpartition("@")[2]:
+            parser.error("--sweep-tags needs --canonical-dir REPOSITORY@REF with {tag} in REF")
+        for option, value in (("--report", args.report), ("--junit", args.junit)):
+            if value is not None and "{tag}" not in str(value):
+                parser.error(f"{option} needs {{tag}} in its path with --sweep-tags")
+        return args
+    try:
+        resolved = resolve_sources(args)
+    except argparse.ArgumentTypeError as error:
+        parser.error(str(error))
+    sources = (resolved.canonical_dir, resolved.records_dir, resolved.web_dir, resolved.machine_dir)
+    if args.watch and not all(source is None or isinstance(source, Path) and source.is_dir() for source in sources):
+        parser.error("--watch needs every source to be a directory")
+    return resolved
 
 
-def main() -> int:
-    args = parse_args()
-    gate = Gate()
+def resolve_sources(args: argparse.Namespace, tag: str | None = None) -> argparse.Namespace:
+    """Open the release sources named on the command line, with {tag} replaced when sweeping."""
+    resolved = argparse.Namespace(**vars(args))
+    for option in ("canonical_dir", "records_dir", "web_dir", "machine_dir", "report", "junit"):
+        value = getattr(args, option)
+        if value is not None and tag is not None:
+            value = str(value).replace("{tag}", tag)
+        if value is None or option in ("report", "junit"):
+            setattr(resolved, option, Path(value) if value is not None else None)
+            continue
+        try:
+            setattr(resolved, option, release_source(value))
+        except argparse.ArgumentTypeError as error:
+            raise argparse.ArgumentTypeError(f"argument --{option.replace('_', '-')}: {error}") from None
+    return resolved
+
+
+def check_membership(
+    gate: Gate,
+    ids: list[str],
+    canonical_by_id: dict[str, dict[str, Any]],
+    machine_by_id: dict[str, dict[str, Any]] | None,
+) -> None:
+    with gate.scope("membership"):
+        gate.equal(set(canonical_by_id), set(ids), "Canonical Archive registry membership")
+        if machine_by_id is not None:
+            gate.equal(set(machine_by_id), set(ids), "Machine Interface mirror membership")
+
+
+def merge_shard_reports(gate: Gate, args: argparse.Namespace, standards: list[dict[str, Any]], started: float) -> int:
+    """Combine --shard reports in baseline order and run the release-wide checks once."""
+    ids = [standard["canonical_id"] for standard in standards]
+    try:
+        with gate.phase("registry_loading"):
+            reports = [load_json(path) for path in args.merge_reports]
+    except Exception as error:
+        print(f"[FATAL] Cannot load shard report: {error}")
+        return 1
+
+    by_standard: dict[str, list[dict[str, Any]]] = {}
+    release_checks: list[dict[str, Any]] = []
+    seen: set[tuple[str, str, str]] = set()
+    with gate.scope("shard"):
+        counts = sorted({(report.get("shard") or {}).get("count") for report in reports}, key=repr)
+        if len(counts) != 1 or not isinstance(counts[0], int):
+            gate.failed(f"shard reports disagree on the shard count: {counts}", "one shard count", counts, "shard count")
+        else:
+            count = counts[0]
+            indices = sorted(report["shard"]["index"] for report in reports)
+            gate.equal(indices, list(range(1, count + 1)), f"shard reports cover shards 1-{count} exactly once")
+            for report in sorted(reports, key=lambda report: report["shard"]["index"]):
+                index = report["shard"]["index"]
+                expected = [canonical_id for canonical_id in ids if shard_of(canonical_id, count) == index]
+                gate.equal(report.get("standards"), expected, f"shard {index}/{count} standards")
+    for report in reports:
+        for name, seconds in report.get("phases", {}).items():
+            gate.phases[name] = gate.phases.get(name, 0.0) + seconds
+        gate.worker_rss_kb = max(gate.worker_rss_kb, round(report.get("pdf_worker_peak_rss_mb", 0) * 1024))
+        for check in report.get("checks", []):
+            if check["standard"] is not None:
+                by_standard.setdefault(check["standard"], []).append(check)
+            elif (key := (check["category"], check["result"], check["message"])) not in seen:
+                # Every shard loads the same registries, so their release checks repeat.
+                seen.add(key)
+                release_checks.append(check)
+
+    def replay(online: bool) -> None:
+        for check in release_checks:
+            if (check["category"] == "online") == online:
+                gate.replay(check)
+        for canonical_id in dict.fromkeys(ids):
+            for check in by_standard.get(canonical_id, ()):
+                if (check["category"] == "online") == online:
+                    gate.replay(check)
+
+    # Replay in the order an unsharded run reports: local checks, membership, then online.
+    with gate.phase("merge"):
+        replay(online=False)
+        canonical_registry = load_json(args.canonical_dir / "registry" / "standards.json")
+        canonical_by_id = {item["canonical_id"]: item for item in canonical_registry["standards"]}
+        machine_by_id = None
+        if args.machine_dir:
+            machine_registry_path = args.machine_dir / "registry" / "standards.json"
+            if machine_registry_path.exists():
+                machine_registry = load_json(machine_registry_path)
+                machine_by_id = {item["canonical_id"]: item for item in machine_registry["standards"]}
+        check_membership(gate, ids, canonical_by_id, machine_by_id)
+        replay(online=True)
+    return conclude(gate, args, standards, started)
+
+
+def load_baseline(gate: Gate, args: argparse.Namespace) -> list[dict[str, Any]] | None:
     manifest_path = args.canonical_dir / "integrity" / "standards.json"
     try:
-        manifest = load_json(manifest_path)
-        standards = manifest["standards"]
+        with gate.phase("registry_loading"):
+            manifest = load_json(manifest_path)
+            standards = manifest["standards"]
     except Exception as error:
         print(f"[FATAL] Cannot load integrity baseline {manifest_path}: {error}")
-        return 1
+        return None
 
     ids = [item["canonical_id"] for item in standards]
-    if len(ids) == len(set(ids)):
-        gate.passed("canonical IDs are unique")
-    else:
-        gate.failed("integrity baseline contains duplicate canonical IDs")
+    if args.shard is None:
+        with gate.scope("baseline"):
+            duplicates = sorted({canonical_id for canonical_id in ids if ids.count(canonical_id) > 1})
+            if not duplicates:
+                gate.passed("canonical IDs are unique", [], duplicates, "canonical IDs are unique")
+            else:
+                gate.failed("integrity baseline contains duplicate canonical IDs", [], duplicates, "canonical IDs are unique")
+    return standards
+
 
-    canonical_registry = load_json(args.canonical_dir / "registry" / "standards.json")
-    canonical_by_id = {item["canonical_id"]: item for item in canonical_registry["standards"]}
-    web_source = None
+Registries = tuple[dict[str, dict[str, Any]], dict[str, WebFields] | None, dict[str, dict[str, Any]] | None]
+
+
+def load_registries(gate: Gate, args: argparse.Namespace) -> Registries:
+    """The Canonical Archive registry, Web source entries and Machine Interface mirror."""
+    with gate.phase("registry_loading"):
+        canonical_registry = load_json(args.canonical_dir / "registry" / "standards.json")
+        canonical_by_id = {item["canonical_id"]: item for item in canonical_registry["standards"]}
+    web_entries = None
     if args.web_dir:
         web_path = args.web_dir / "lib" / "registry.ts"
-        if web_path.exists():
-            web_source = web_path.read_text(encoding="utf-8")
-        else:
-            gate.failed(f"RuleMark Web source registry missing: {web_path}")
+        with gate.phase("web_source"), gate.scope("web_source"):
+            if web_path.exists():
+                web_entries = parse_web_registry(web_path.read_text(encoding="utf-8"))
+            else:
+                gate.failed(
+                    f"RuleMark Web source registry missing: {web_path}", str(web_path), None, "RuleMark Web source registry"
+                )
 
     machine_by_id: dict[str, dict[str, Any]] | None = None
     if args.machine_dir:
         machine_registry_path = args.machine_dir / "registry" / "standards.json"
-        if machine_registry_path.exists():
-            machine_registry = load_json(machine_registry_path)
-            gate.equal(
-                machine_registry.get("registry_meta", {}).get("authority"),
-                "derived_from_canonical_archive",
-                "Machine Interface registry authority boundary",
-            )
-            machine_by_id = {item["canonical_id"]: item for item in machine_registry["standards"]}
-        else:
-            gate.failed(f"Machine Interface derived registry missing: {machine_registry_path}")
+        with gate.phase("registry_loading"), gate.scope("machine_registry"):
+            if machine_registry_path.exists():
+                machine_registry = load_json(machine_registry_path)
+                gate.equal(
+                    machine_registry.get("registry_meta", {}).get("authority"),
+                    "derived_from_canonical_archive",
+                    "Machine Interface registry authority boundary",
+                )
+                machine_by_id = {item["canonical_id"]: item for item in machine_registry["standards"]}
+            else:
+                gate.failed(
+                    f"Machine Interface derived registry missing: {machine_registry_path}",
+                    str(machine_registry_path),
+                    None,
+                    "Machine Interface derived registry",
+                )
+    return canonical_by_id, web_entries, machine_by_id
 
-    for standard in standards:
-        canonical_id = standard["canonical_id"]
-        record_path = args.records_dir / standard["record_filename"]
-        check_pdf(gate, standard, record_path, "Records PDF")
-
-        alias = standard.get("canonical_alias_filename")
-        if alias:
-            alias_path = args.records_dir / alias
-            check_pdf(gate, standard, alias_path, "canonical-ID alias")
-            if record_path.exists() and alias_path.exists():
-                gate.equal(record_path.read_bytes(), alias_path.read_bytes(), f"{canonical_id} legacy filename alias bytes")
-
-        canonical_document = standard.get("canonical_document")
-        if canonical_document:
-            check_pdf(gate, standard, args.canonical_dir / canonical_document, "Canonical Archive PDF")
-        check_signature(gate, standard, args.canonical_dir)
-        check_canonical_registry(gate, standard, canonical_by_id)
-        if web_source is not None:
-            check_web_source(gate, standard, web_source)
-        if args.machine_dir:
-            machine_artifact = args.machine_dir / "artifacts" / f"{canonical_id}.pdf"
-            if machine_artifact.exists():
-                check_pdf(gate, standard, machine_artifact, "Machine Interface artifact")
-            if machine_by_id is not None:
-                mirror = machine_by_id.get(canonical_id)
-                if mirror is None:
-                    gate.failed(f"{canonical_id} absent from Machine Interface derived registry")
-                else:
-                    gate.equal(mirror.get("version"), standard["version"], f"{canonical_id} machine mirror version")
-                    gate.equal(mirror.get("status"), standard["status"], f"{canonical_id} machine mirror status")
 
-    gate.equal(set(canonical_by_id), set(ids), "Canonical Archive registry membership")
-    if machine_by_id is not None:
-        gate.equal(set(machine_by_id), set(ids), "Machine Interface mirror membership")
+def verify(args: argparse.Namespace, files: ReleaseFiles) -> int:
+    started = time.perf_counter()
+    gate = Gate()
+    standards = load_baseline(gate, args)
+    if standards is None:
+        return 1
+    ids = [item["canonical_id"] for item in standards]
+    if args.merge_reports:
+        return merge_shard_reports(gate, args, standards, started)
+    if args.shard is not None:
+        index, count = args.shard
+        standards = [standard for standard in standards if shard_of(standard["canonical_id"], count) == index]
+    canonical_by_id, web_entries, machine_by_id = load_registries(gate, args)
+
+    state: dict[str, str] | None = None
+    input_digests: dict[str, str] = {}
+    unchanged: set[str] = set()
+    with gate.phase("pdf_parsing"):
+        if args.incremental:
+            previous = load_gate_state(args.state_file)
+            files.collect(release_pdfs(standards, args), parse=False)
+            input_digests = {
+                standard["canonical_id"]: standard_input_digest(
+                    standard, args, files, canonical_by_id, web_entries, machine_by_id
+                )
+                for standard in standards
+            }
+            unchanged = {key for key, digest in input_digests.items() if previous.get(key) == digest}
+            state = {key: previous[key] for key in unchanged}
+        files.collect(
+            [pdf for standard in standards if standard["canonical_id"] not in unchanged for pdf in standard_pdfs(standard, args)]
+        )
+
+    def run_standard(standard: dict[str, Any]) -> Gate:
+        unit = gate.fork()
+        check_standard(unit, standard, args, files, canonical_by_id, web_entries, machine_by_id)
+        return unit
+
+    with gate.phase("checks"), ThreadPoolExecutor(max_workers=args.jobs) as executor:
+        # Standards are checked concurrently but merged in baseline order, so output is deterministic.
+        units = {
+            index: executor.submit(run_standard, standard)
+            for index, standard in enumerate(standards)
+            if standard["canonical_id"] not in unchanged
+        }
+        for index, standard in enumerate(standards):
+            canonical_id = standard["canonical_id"]
+            if index not in units:
+                with gate.scope("incremental", canonical_id):
+                    gate.skipped(f"{canonical_id} inputs unchanged since the last passing run")
+                continue
+            unit = units[index].result()
+            gate.merge(unit)
+            if state is not None and not unit.failures:
+                state[canonical_id] = input_digests[canonical_id]
+
+        if args.shard is None:
+            check_membership(gate, ids, canonical_by_id, machine_by_id)
     if args.online:
-        check_online(gate, standards, args.base_url.rstrip("/"))
+        with gate.phase("online"), gate.scope("online"):
+            fixtures = args.record_fixtures or args.replay_fixtures
+            with Fetcher(
+                args.online_workers,
+                args.per_host,
+                fixtures=FixtureStore(fixtures) if fixtures is not None else None,
+                replay=args.replay_fixtures is not None,
+                latency=args.replay_latency_ms / 1000,
+                server=args.fixture_server,
+            ) as fetcher:
+                check_online(gate, standards, args.base_url.rstrip("/"), fetcher)
+    if state is not None:
+        save_gate_state(args.state_file, state)
+
+    gate.worker_rss_kb = files.sandbox.peak_rss_kb
+    return conclude(gate, args, standards, started)
+
+
+def conclude(gate: Gate, args: argparse.Namespace, standards: list[dict[str, Any]], started: float) -> int:
+    duration = time.perf_counter() - started
+    if args.report:
+        write_json_report(args.report, gate, standards, duration, args.shard)
+    if args.junit:
+        write_junit_report(args.junit, gate, duration)
 
     print("\n=== RuleMark Integrity Gate ===")
     if gate.failures:
@@ -317,5 +2240,225 @@ def main() -> int:
     return 0
 
 
+class DirectoryWatcher:
+    """Report paths that change under a set of directory trees.
+
+    On Linux this uses inotify through libc, with a watch per directory;
+    elsewhere, or when inotify is unavailable, the trees are stat-polled
+    every interval seconds. wait() blocks until something changes, then
+    collects further events until the trees have been quiet for settle
+    seconds, so an editor's write-and-rename save is reported once. When
+    events are lost or a whole directory moves, the roots themselves are
+    reported and the trees are watched afresh.
+    """
+
+    EVENTS = 0x8 | 0x40 | 0x80 | 0x100 | 0x200 | 0x400 | 0x800  # close-write, moves, create, deletes
+    SELF = 0x400 | 0x800  # the watched directory itself was deleted or moved
+    IS_DIRECTORY = 0x40000000
+    OVERFLOW = 0x4000
+    HEADER = struct.Struct("iIII")
+
+    def __init__(self, roots: list[Path], interval: float = 0.5, settle: float = 0.02) -> None:
+        self.roots = roots
+        self.interval = interval
+        self.settle = settle
+        self.directories: dict[int, Path] = {}
+        self.fd: int | None = None
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True) if libc_name else None
+        if libc is not None and hasattr(libc, "inotify_init1"):
+            self.libc = libc
+            fd = libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+            if fd >= 0:
+                self.fd = fd
+                for root in roots:
+                    self.add_tree(root)
+        if self.fd is None:
+            self.snapshot = self.scan()
+
+    @property
+    def mechanism(self) -> str:
+        return "inotify" if self.fd is not None else f"stat polling every {self.interval}s"
+
+    def add_tree(self, root: Path) -> None:
+        for directory, _, _ in os.walk(root):
+            descriptor = self.libc.inotify_add_watch(self.fd, os.fsencode(directory), self.EVENTS)
+            if descriptor >= 0:
+                self.directories[descriptor] = Path(directory)
+
+    def scan(self) -> dict[Path, tuple[int, int, int]]:
+        snapshot = {}
+        for root in self.roots:
+            for directory, _, names in os.walk(root):
+                for name in names:
+                    path = Path(directory, name)
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    snapshot[path] = stat.st_mtime_ns, stat.st_size, stat.st_ino
+        return snapshot
+
+    def rewatch(self) -> None:
+        for descriptor in self.directories:
+            self.libc.inotify_rm_watch(self.fd, descriptor)  # fails harmlessly for a directory already gone
+        self.directories.clear()
+        for root in self.roots:
+            self.add_tree(root)
+
+    def wait(self) -> set[Path]:
+        if self.fd is None:
+            while True:
+                time.sleep(self.interval)
+                snapshot = self.scan()
+                differences = {path for path in snapshot.keys() | self.snapshot.keys() if snapshot.get(path) != self.snapshot.get(path)}
+                self.snapshot = snapshot
+                if differences:
+                    return differences
+        changed: set[Path] = set()
+        select.select([self.fd], [], [])
+        while select.select([self.fd], [], [], self.settle)[0]:
+            changed |= self.read_events()
+        if any(root in changed for root in self.roots):
+            self.rewatch()
+        return changed
+
+    def read_events(self) -> set[Path]:
+        assert self.fd is not None
+        changed = set()
+        data = os.read(self.fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            descriptor, mask, _, length = self.HEADER.unpack_from(data, offset)
+            name = data[offset + self.HEADER.size : offset + self.HEADER.size + length].rstrip(b"\0")
+            offset += self.HEADER.size + length
+            if mask & self.OVERFLOW:
+                # Events were lost; report the roots so the caller starts over.
+                changed.update(self.roots)
+                continue
+            directory = self.directories.get(descriptor)
+            if directory is None or not (name or mask & self.SELF):
+                continue
+            if not name or mask & self.IS_DIRECTORY:
+                # A watched directory moved or went away, or a subdirectory was created, moved or
+                # deleted: every path under it changed at once, so report the roots.
+                changed.update(self.roots)
+                if not name:
+                    continue
+            path = directory / os.fsdecode(name)
+            changed.add(path)
+            if mask & self.IS_DIRECTORY and path.is_dir():
+                self.add_tree(path)
+        return changed
+
+
+def watch(args: argparse.Namespace, files: ReleaseFiles) -> int:
+    """Verify, then re-verify only the standards whose inputs change, until interrupted."""
+    roots = [root for root in (args.canonical_dir, args.records_dir, args.web_dir, args.machine_dir) if root is not None]
+    metadata = {args.canonical_dir / "integrity" / "standards.json", args.canonical_dir / "registry" / "standards.json"}
+    if args.web_dir:
+        metadata.add(args.web_dir / "lib" / "registry.ts")
+    if args.machine_dir:
+        metadata.add(args.machine_dir / "registry" / "standards.json")
+    watcher = DirectoryWatcher(roots)
+    print(f"Watching {len(roots)} director{'y' if len(roots) == 1 else 'ies'} with {watcher.mechanism}; Ctrl-C stops")
+
+    loaded: tuple[Gate, list[dict[str, Any]], Registries] | None = None
+    digests: dict[str, str] = {}
+    units: dict[str, Gate] = {}
+    changed_paths: set[Path] = set()
+    code = 1
+    try:
+        while True:
+            started = time.perf_counter()
+            gate = Gate()
+            reload = loaded is None or bool(changed_paths & metadata) or any(root in changed_paths for root in roots)
+            try:
+                if reload:
+                    release = gate.fork()
+                    standards = load_baseline(release, args)
+                    if standards is None:
+                        raise ValueError("integrity baseline unavailable")
+                    loaded = release, standards, load_registries(release, args)
+                assert loaded is not None
+                release, standards, registries = loaded
+                gate.merge(release, echo=reload)
+                canonical_by_id, web_entries, machine_by_id = registries
+                current = {
+                    standard["canonical_id"]: standard_input_digest(standard, args, files, *registries)
+                    for standard in standards
+                }
+                stale = [standard for standard in standards if digests.get(standard["canonical_id"]) != current[standard["canonical_id"]]]
+                files.collect([pdf for standard in stale for pdf in standard_pdfs(standard, args)])
+
+                def run_standard(standard: dict[str, Any]) -> Gate:
+                    unit = gate.fork()
+                    check_standard(unit, standard, args, files, canonical_by_id, web_entries, machine_by_id)
+                    return unit
+
+                with ThreadPoolExecutor(max_workers=args.jobs) as executor:
+                    units.update(zip((standard["canonical_id"] for standard in stale), executor.map(run_standard, stale)))
+                digests = current
+                print(f"\n--- {time.strftime('%H:%M:%S')} re-verified {len(stale)} of {len(standards)} standard(s) ---")
+                stale_ids = {standard["canonical_id"] for standard in stale}
+                for standard in standards:
+                    gate.merge(units[standard["canonical_id"]], echo=standard["canonical_id"] in stale_ids)
+                check_membership(gate, [standard["canonical_id"] for standard in standards], canonical_by_id, machine_by_id)
+                gate.worker_rss_kb = files.sandbox.peak_rss_kb
+                code = conclude(gate, args, standards, started)
+            except Exception as error:  # a half-saved file; wait for the next save
+                loaded = None
+                print(f"[ERROR] {error}; waiting for the next change")
+            changed_paths = watcher.wait()
+            files.forget(None if any(root in changed_paths for root in roots) else changed_paths)
+            # Other names of a changed file, and changes whose events were lost, show up only in a stat.
+            files.revalidate()
+    except KeyboardInterrupt:
+        return code
+
+
+def sweep_tags(args: argparse.Namespace, files: ReleaseFiles) -> int:
+    """Verify each matching tag in turn; PDFs unchanged between tags are hashed and parsed once."""
+    repository = Path(args.canonical_dir.rpartition("@")[0]).resolve()
+    try:
+        tags = git_repository(repository).tags(args.sweep_tags)
+    except OSError as error:
+        print(f"[FATAL] Cannot list tags of {repository}: {error}")
+        return 1
+    if not tags:
+        print(f"[FATAL] No tags of {repository} match {args.sweep_tags!r}")
+        return 1
+    results: dict[str, int] = {}
+    for tag in tags:
+        print(f"\n##### {tag} #####")
+        try:
+            results[tag] = verify(resolve_sources(args, tag), files)
+        except argparse.ArgumentTypeError as error:
+            print(f"[FATAL] {error}")
+            results[tag] = 1
+
+    print("\n=== RuleMark Integrity Gate sweep ===")
+    for tag, code in results.items():
+        print(f"{'BLOCKED' if code else 'PASS'}: {tag}")
+    return 1 if any(results.values()) else 0
+
+
+def main() -> int:
+    args = parse_args()
+    cache = None
+    if not args.no_cache:
+        try:
+            cache = PdfFactsCache(args.cache, args.cache_max_mb * 1024 * 1024)
+        except (OSError, sqlite3.Error) as error:
+            print(f"[WARN] PDF facts cache disabled: {error}")
+    files = ReleaseFiles(PdfSandbox(args.pdf_cpu_seconds, args.pdf_memory_mb * 1024 * 1024), args.jobs, cache)
+    try:
+        if args.watch:
+            return watch(args, files)
+        return sweep_tags(args, files) if args.sweep_tags is not None else verify(args, files)
+    finally:
+        files.close()
+
+
 if __name__ == "__main__":
     sys.exit(main())
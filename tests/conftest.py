@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# The scripts and tools are run as plain scripts and import their neighbours by module name.
+sys.path[:0] = [str(ROOT / "scripts"), str(ROOT / "tools")]
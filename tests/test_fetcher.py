@@ -0,0 +1,69 @@
+import threading
+import time
+import urllib.parse
+from collections import Counter
+
+from fixture_server import FixtureServer
+from verify_release import Fetcher, FixtureStore
+
+HOSTS = ("a.example", "b.example")
+PAGES = 8
+PER_HOST = 2
+
+
+class CountingStore(FixtureStore):
+    """A fixture store that holds each response briefly and tracks how many are in flight per host."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.active = Counter()
+        self.peak = Counter()
+
+    def response(self, url):
+        host = urllib.parse.urlsplit(url).hostname
+        with self.lock:
+            self.active[host] += 1
+            self.peak[host] = max(self.peak[host], self.active[host])
+        time.sleep(0.05)
+        with self.lock:
+            self.active[host] -= 1
+        return super().response(url)
+
+
+class CountingServer(FixtureServer):
+    connections = 0
+
+    def process_request(self, request, client_address):
+        # Called once per accepted connection, on the serving thread.
+        self.connections += 1
+        super().process_request(request, client_address)
+
+
+def serve(store):
+    server = CountingServer(("127.0.0.1", 0), store, 0.0, 0.0, 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_fetcher_limits_hosts_shares_urls_and_reuses_connections(tmp_path):
+    store = CountingStore(tmp_path / "fixtures")
+    urls = [f"http://{host}/page/{page}" for host in HOSTS for page in range(PAGES)]
+    for url in urls:
+        store.record(url, 200, None, url.encode("utf-8"))
+
+    server = serve(store)
+    try:
+        with Fetcher(workers=16, per_host=PER_HOST, server=server.server_address[:2]) as fetcher:
+            futures = [fetcher.get(url) for url in urls for _ in range(3)]
+            bodies = [future.result(timeout=30) for future in futures]
+            assert fetcher.get(urls[0]) is futures[0]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert bodies == [url.encode("utf-8") for url in urls for _ in range(3)]
+    # Repeated URLs share one request, and no host ever sees more than per_host at once.
+    assert server.requests == len(urls)
+    assert store.peak == {host: PER_HOST for host in HOSTS}
+    # Keep-alive connections go back to the host's pool instead of one per request.
+    assert server.connections <= PER_HOST * len(HOSTS)
@@ -0,0 +1,67 @@
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+
+from benchmark_gate import GATE, generate
+
+SUMMARY = "=== RuleMark Integrity Gate ==="
+
+
+def gate_command(root, report):
+    command = [sys.executable, str(GATE), "--no-cache", "--jobs", "2", "--report", str(report)]
+    for option in ("canonical", "records", "web", "machine"):
+        command += [f"--{option}-dir", str(root / option)]
+    return command
+
+
+def failed_checks(report):
+    return sorted(check["name"] for check in json.loads(report.read_text(encoding="utf-8"))["checks"] if check["result"] == "fail")
+
+
+class Watch:
+    """verify_release.py --watch in a subprocess, read one summary at a time."""
+
+    def __init__(self, command):
+        self.process = subprocess.Popen(
+            command, stdout=subprocess.PIPE, text=True, env={**os.environ, "PYTHONUNBUFFERED": "1"}
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=lambda: [self.lines.put(line) for line in self.process.stdout], daemon=True).start()
+
+    def summary(self, timeout=120):
+        line = ""
+        while not line.startswith(SUMMARY):
+            line = self.lines.get(timeout=timeout)
+        return self.lines.get(timeout=timeout).strip()
+
+    def close(self):
+        self.process.kill()
+        self.process.wait()
+
+
+def test_watch_rehashes_every_name_of_an_edited_hard_link(tmp_path):
+    root = tmp_path / "release"
+    generate(root, 1, 1, 1)
+    record = root / "records" / "rm-s-bench-00001-record.pdf"
+    alias = root / "records" / "RM-S-BENCH-00001.pdf"
+    assert os.path.samefile(record, alias)
+
+    watch = Watch([*gate_command(root, tmp_path / "watch.json"), "--watch"])
+    try:
+        assert watch.summary().startswith("PASS")
+        with record.open("ab") as handle:
+            handle.write(b"\n")
+        assert watch.summary().startswith("BLOCKED")
+    finally:
+        watch.close()
+
+    fresh = subprocess.run(gate_command(root, tmp_path / "fresh.json"), stdout=subprocess.DEVNULL)
+    assert fresh.returncode == 1
+    failures = failed_checks(tmp_path / "watch.json")
+    assert failures == failed_checks(tmp_path / "fresh.json")
+    # The records PDF, its alias, the Canonical Archive PDF and the Machine Interface artifact all changed.
+    for name in ("Records PDF", "canonical-ID alias", "Canonical Archive PDF", "Machine Interface artifact"):
+        assert f"RM-S-BENCH-00001 {name} SHA-256" in failures
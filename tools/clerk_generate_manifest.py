@@ -1,45 +1,146 @@
-import os, json, hashlib, datetime, glob
+import os, json, hashlib, datetime, glob, argparse, itertools
+from concurrent.futures import ThreadPoolExecutor
+
+import jsonl_manifest
+import merkle
 
 MACHINE_DIR = "machine"
 OUTPUT_FILE = "registry/manifests/batch_manifest.json"
+MANIFEST_TYPE = "RULEMARK_BATCH_MANIFEST"
+HASH_CACHE = ".clerk-hash-cache.json"
 
-def main():
-    items = []
-    # 模拟扫描 machine 目录
-    files = glob.glob(os.path.join(MACHINE_DIR, "*.json"))
-    if not files:
-        print("   [Clerk] No files found in machine/. Creating dummy data...")
-        # 自动生成一个测试文件
-        dummy_path = os.path.join(MACHINE_DIR, "RM-S-TEST-001.json")
-        with open(dummy_path, "w") as f:
-            json.dump({"canonical_id": "RM-S-TEST-001", "status": "PASS", "version": "1.0"}, f)
-        files = [dummy_path]
-
-    for fpath in files:
-        with open(fpath, "r") as f:
-            data = json.load(f)
-        if data.get("status") == "PASS":
-            with open(fpath, "rb") as f:
-                f_hash = "sha256:" + hashlib.sha256(f.read()).hexdigest()
-            items.append({
-                "canonical_id": data["canonical_id"],
-                "file_hash": f_hash,
-                "status": "PASS"
-            })
-
-    # 生成 Merkle Root (简化版)
-    concat = "".join([i["file_hash"] for i in items]).encode("utf-8")
-    merkle_root = "sha256:" + hashlib.sha256(concat).hexdigest()
-
-    manifest = {
-        "meta": {"type": "RULEMARK_BATCH_MANIFEST", "batch_id": "AUTO-001"},
-        "consensus_target": {"merkle_root": merkle_root},
+def summarize(raw, data):
+    """What the manifest needs from one record: its hash, id and status."""
+    return {
+        "canonical_id": data.get("canonical_id"),
+        "file_hash": "sha256:" + hashlib.sha256(raw).hexdigest(),
+        "status": data.get("status")
+    }
+
+def summary_items(summaries):
+    return [
+        {"canonical_id": s["canonical_id"], "file_hash": s["file_hash"], "status": "PASS"}
+        for s in summaries
+        if s["status"] == "PASS"
+    ]
+
+def manifest_items(records, jobs=None):
+    """Manifest items for (path, raw bytes, parsed) records whose status is PASS."""
+    # hashlib 计算时释放 GIL，线程池可以并行 hash
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return summary_items(pool.map(lambda r: summarize(r[1], r[2]), records))
+
+class HashCache:
+    """Sidecar cache of (path, size, mtime) -> record summary."""
+
+    def __init__(self, path=HASH_CACHE):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.files = json.load(f).get("files", {})
+        except (FileNotFoundError, ValueError):
+            self.files = {}
+        self.seen = {}
+
+    def cached(self, path):
+        """The cached summary if the file's size and mtime are unchanged, else None."""
+        # stat 在读文件之前：读取期间被修改的文件下次会重新 hash
+        st = os.stat(path)
+        entry = self.files.get(path)
+        if entry and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+            self.seen[path] = entry
+            return entry["summary"]
+        self.seen[path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "summary": None}
+        return None
+
+    def summarize(self, path):
+        with open(path, "rb") as f:
+            raw = f.read()
+        summary = summarize(raw, json.loads(raw))
+        self.seen[path]["summary"] = summary
+        return summary
+
+    def save(self):
+        # 只保留本次扫描到的文件，删除的记录不会留在缓存里
+        temp = self.path + ".tmp"
+        with open(temp, "w") as f:
+            f.write(json.dumps({"files": self.seen}, sort_keys=True))
+        os.replace(temp, self.path)
+
+def scan(files, cache, jobs=None, chunk=1024):
+    """Summaries of files in order; only files changed since the cache are read and hashed.
+
+    Yields as it goes, holding at most one chunk of summaries in memory.
+    """
+    files = iter(files)
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while batch := list(itertools.islice(files, chunk)):
+            summaries = [cache.cached(path) for path in batch]
+            changed = [i for i, summary in enumerate(summaries) if summary is None]
+            for i, summary in zip(changed, pool.map(cache.summarize, [batch[i] for i in changed])):
+                summaries[i] = summary
+            yield from summaries
+
+def signer_meta(key_id):
+    """Key ID and issue time, so bulk verification can pick the key valid at signing."""
+    if not key_id:
+        return {}
+    issued_at = datetime.datetime.now(datetime.timezone.utc).replace(microsecond=0)
+    return {"key_id": key_id, "issued_at": issued_at.isoformat().replace("+00:00", "Z")}
+
+def build_manifest(items, key_id=None):
+    # 生成 Merkle Root，每个 item 附带 inclusion proof
+    merkle_root = merkle.prove(items)
+
+    return {
+        "meta": {"type": MANIFEST_TYPE, "batch_id": "AUTO-001", **signer_meta(key_id)},
+        "consensus_target": {"merkle_root": merkle_root, "tree": merkle.TREE, "size": len(items)},
         "items": items
     }
-    
-    with open(OUTPUT_FILE, "w") as f:
-        json.dump(manifest, f, indent=2)
-    print(f"   [Clerk] Generated Manifest: {len(items)} items")
+
+def write_manifest(manifest, log=print):
+    data = json.dumps(manifest, indent=2).encode("utf-8")
+    with open(OUTPUT_FILE, "wb") as f:
+        f.write(data)
+    log(f"   [Clerk] Generated Manifest: {len(manifest['items'])} items")
+    return data
+
+def create_dummy(log=print):
+    log("   [Clerk] No files found in machine/. Creating dummy data...")
+    # 自动生成一个测试文件
+    dummy_path = os.path.join(MACHINE_DIR, "RM-S-TEST-001.json")
+    with open(dummy_path, "w") as f:
+        json.dump({"canonical_id": "RM-S-TEST-001", "status": "PASS", "version": "1.0"}, f)
+    return dummy_path
+
+def write_jsonl(summaries, log=print, key_id=None):
+    count, root, _ = jsonl_manifest.write(
+        (
+            {"canonical_id": s["canonical_id"], "file_hash": s["file_hash"], "status": "PASS"}
+            for s in summaries
+            if s["status"] == "PASS"
+        ),
+        meta=signer_meta(key_id),
+    )
+    log(f"   [Clerk] Generated streaming manifest: {count} items, root {root}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the batch manifest from machine/*.json.")
+    parser.add_argument("--jsonl", action="store_true", help=f"write the streaming manifest {jsonl_manifest.JSONL_PATH}")
+    parser.add_argument("--key-id", help="record the signing key ID and issue time in the manifest meta")
+    args = parser.parse_args()
+
+    # 模拟扫描 machine 目录
+    if not glob.glob(os.path.join(MACHINE_DIR, "*.json")):
+        create_dummy()
+
+    cache = HashCache()
+    if args.jsonl:
+        write_jsonl(scan(glob.iglob(os.path.join(MACHINE_DIR, "*.json")), cache), key_id=args.key_id)
+    else:
+        files = glob.glob(os.path.join(MACHINE_DIR, "*.json"))
+        write_manifest(build_manifest(summary_items(scan(files, cache)), args.key_id))
+    cache.save()
 
 if __name__ == "__main__":
     main()
@@ -6,25 +6,40 @@ from pathlib import Path
 TARGET_STATUS_FROM = "DRAFT"
 TARGET_STATUS_TO = "FROZEN"
 
-def git(cmd):
-    subprocess.run(cmd, check=True)
-
-def freeze_file(path: Path):
-    with open(path) as f:
-        data = json.load(f)
+def git(cmd, log=print):
+    # git's output goes through log, so the pipeline prints it under the freeze stage
+    completed = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    for line in completed.stdout.splitlines():
+        log(line)
+    if completed.returncode != 0:
+        raise subprocess.CalledProcessError(completed.returncode, cmd, completed.stdout)
+
+def freeze_file(path: Path, data=None, log=print):
+    if data is None:
+        with open(path) as f:
+            data = json.load(f)
 
     if data.get("status") != TARGET_STATUS_FROM:
-        print(f"[SKIP] {path} not DRAFT")
+        log(f"[SKIP] {path} not DRAFT")
         return False
 
-    data["status"] = TARGET_STATUS_TO
+    data = dict(data, status=TARGET_STATUS_TO)
 
     with open(path, "w") as f:
         json.dump(data, f, indent=2, sort_keys=True)
 
-    print(f"[FROZEN] {path}")
+    log(f"[FROZEN] {path}")
     return True
 
+def commit_frozen(changed, log=print):
+    if not changed:
+        log("Nothing to freeze")
+        return
+
+    git(["git", "add", "machine"], log)
+    git(["git", "commit", "-m", "SIGNATURE: DavidWei"], log)
+    git(["git", "push"], log)
+
 def main():
     changed = False
 
@@ -32,13 +47,7 @@ def main():
         for path in Path(folder).rglob("*.json"):
             changed |= freeze_file(path)
 
-    if not changed:
-        print("Nothing to freeze")
-        return
-
-    git(["git", "add", "machine"])
-    git(["git", "commit", "-m", "SIGNATURE: DavidWei"])
-    git(["git", "push"])
+    commit_frozen(changed)
 
 if __name__ == "__main__":
     main()
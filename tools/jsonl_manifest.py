@@ -0,0 +1,106 @@
+"""Streaming JSONL batch manifest for very large batches.
+
+Line 1 is a header ({"meta": ...}), then one item per line, then a trailer
+({"consensus_target": ...}) holding the Merkle root and item count. The
+root is built leaf by leaf, so writing and verifying need constant memory.
+Items carry no inclusion proofs; a proof needs the whole tree.
+
+The signature covers a domain-separated SHA-256 of the file, computed while
+the file streams, not the raw file bytes.
+"""
+
+import hashlib
+import json
+import os
+
+import merkle
+
+JSONL_PATH = "registry/manifests/batch_manifest.jsonl"
+STREAM_TYPE = "RULEMARK_BATCH_MANIFEST_STREAM"
+SIGNED_PREFIX = b"RULEMARK-JSONL-MANIFEST-SHA256\x00"
+CHUNK = 1 << 20
+
+
+def line(obj):
+    return (json.dumps(obj, sort_keys=True, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def signed_message(digest):
+    """The bytes that are signed for a manifest whose streamed SHA-256 is digest."""
+    return SIGNED_PREFIX + digest
+
+
+def write(items, path=JSONL_PATH, batch_id="AUTO-001", meta=None):
+    """Write items (any iterable) and return (count, encoded root, streamed digest)."""
+    h, tree = hashlib.sha256(), merkle.MerkleStream()
+    temp = path + ".tmp"
+    with open(temp, "wb") as f:
+        def emit(obj):
+            data = line(obj)
+            h.update(data)
+            f.write(data)
+
+        emit({"meta": {"type": STREAM_TYPE, "batch_id": batch_id, **(meta or {})}})
+        for item in items:
+            tree.append(merkle.leaf_hash(merkle.leaf_data(item)))
+            emit(item)
+        root = merkle.encode(tree.root())
+        emit({"consensus_target": {"merkle_root": root, "tree": merkle.TREE, "size": tree.size}})
+    os.replace(temp, path)
+    return tree.size, root, h.digest()
+
+
+def digest(path=JSONL_PATH):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            h.update(chunk)
+    return h.digest()
+
+
+def parse_line(data, number):
+    obj = json.loads(data)
+    if not isinstance(obj, dict):
+        raise ValueError(f"line {number} is not an object")
+    return obj
+
+
+def header(path=JSONL_PATH):
+    """The header's meta; raises ValueError if line 1 is not a streaming manifest header."""
+    with open(path, "rb") as f:
+        meta = parse_line(f.readline() or b"{}", 1).get("meta")
+    if not isinstance(meta, dict) or meta.get("type") != STREAM_TYPE:
+        raise ValueError(f"line 1 is not a {STREAM_TYPE} header")
+    return meta
+
+
+def check(path=JSONL_PATH):
+    """Stream the file, check its items against the trailer and return its digest.
+
+    Raises ValueError if the header, items or trailer do not agree.
+    """
+    h, tree = hashlib.sha256(), merkle.MerkleStream()
+    trailer = None
+    with open(path, "rb") as f:
+        for number, data in enumerate(f, 1):
+            h.update(data)
+            obj = parse_line(data, number)
+            if number == 1:
+                meta = obj.get("meta")
+                if not isinstance(meta, dict) or meta.get("type") != STREAM_TYPE:
+                    raise ValueError(f"line 1 is not a {STREAM_TYPE} header")
+            elif trailer is not None:
+                raise ValueError(f"line {number} follows the trailer")
+            elif "consensus_target" in obj:
+                trailer = obj["consensus_target"]
+                if not isinstance(trailer, dict):
+                    raise ValueError(f"line {number} is not a trailer object")
+            else:
+                tree.append(merkle.leaf_hash(merkle.leaf_data(obj)))
+    if trailer is None:
+        raise ValueError("missing trailer; the manifest is truncated")
+    if trailer.get("tree") != merkle.TREE or trailer.get("size") != tree.size:
+        raise ValueError(f"trailer says {trailer.get('size')} items, found {tree.size}")
+    if trailer.get("merkle_root") != merkle.encode(tree.root()):
+        raise ValueError("items do not match the trailer's Merkle root")
+    return h.digest()
@@ -0,0 +1,131 @@
+"""Binary Merkle tree over manifest items (RFC 6962 / RFC 9162 shape).
+
+Leaves and interior nodes are domain separated: a leaf is
+SHA-256(0x00 || data) and a node is SHA-256(0x01 || left || right), so a
+node can never be passed off as a leaf. A tree of n items splits at the
+largest power of two below n. Hashes are written as "sha256:<hex>".
+"""
+
+import hashlib
+import json
+
+PREFIX = "sha256:"
+TREE = "rfc6962-sha256"
+
+
+def encode(digest):
+    return PREFIX + digest.hex()
+
+
+def decode(value):
+    if not value.startswith(PREFIX):
+        raise ValueError(f"not a sha256 hash: {value}")
+    return bytes.fromhex(value[len(PREFIX):])
+
+
+def leaf_data(item):
+    # 叶子只覆盖 item 本身，不含 proof
+    fields = {k: v for k, v in item.items() if k != "proof"}
+    return json.dumps(fields, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def leaf_hash(data):
+    return hashlib.sha256(b"\x00" + data).digest()
+
+
+def node_hash(left, right):
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+
+def split(n):
+    k = 1
+    while k * 2 < n:
+        k *= 2
+    return k
+
+
+def tree(leaves):
+    """Return (root, paths): the root and every leaf's audit path, leaf first."""
+    if not leaves:
+        return hashlib.sha256(b"").digest(), []
+    paths = [[] for _ in leaves]
+
+    def build(lo, hi):
+        if hi - lo == 1:
+            return leaves[lo]
+        mid = lo + split(hi - lo)
+        left, right = build(lo, mid), build(mid, hi)
+        for i in range(lo, mid):
+            paths[i].append(right)
+        for i in range(mid, hi):
+            paths[i].append(left)
+        return node_hash(left, right)
+
+    return build(0, len(leaves)), paths
+
+
+def prove(items):
+    """Attach an inclusion proof to each item and return the encoded root."""
+    root, paths = tree([leaf_hash(leaf_data(item)) for item in items])
+    for index, (item, path) in enumerate(zip(items, paths)):
+        item["proof"] = {"index": index, "path": [encode(p) for p in path]}
+    return encode(root)
+
+
+def verify_inclusion(leaf, index, size, path, root):
+    """Check a leaf hash against a root in O(log n) (RFC 9162, 2.1.3.2)."""
+    if index >= size:
+        return False
+    fn, sn, r = index, size - 1, leaf
+    for p in path:
+        if sn == 0:
+            return False
+        if fn & 1 or fn == sn:
+            r = node_hash(p, r)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = node_hash(r, p)
+        fn >>= 1
+        sn >>= 1
+    return sn == 0 and r == root
+
+
+def verify_item(item, size, root):
+    """Check a manifest item carrying its proof against an encoded root."""
+    proof = item.get("proof") or {}
+    try:
+        path = [decode(p) for p in proof.get("path", [])]
+        return verify_inclusion(leaf_hash(leaf_data(item)), proof.get("index", size), size, path, decode(root))
+    except (ValueError, TypeError):
+        return False
+
+
+class MerkleStream:
+    """Root of the same tree, built leaf by leaf in O(log n) memory.
+
+    The stack holds the roots of the perfect subtrees seen so far, largest
+    first; folding it from the right reproduces the RFC 6962 split.
+    """
+
+    def __init__(self):
+        self.stack = []
+        self.size = 0
+
+    def append(self, leaf):
+        width, h = 1, leaf
+        while self.stack and self.stack[-1][0] == width:
+            _, left = self.stack.pop()
+            h = node_hash(left, h)
+            width *= 2
+        self.stack.append((width, h))
+        self.size += 1
+
+    def root(self):
+        if not self.stack:
+            return hashlib.sha256(b"").digest()
+        h = self.stack[-1][1]
+        for _, left in reversed(self.stack[:-1]):
+            h = node_hash(left, h)
+        return h
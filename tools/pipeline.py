@@ -0,0 +1,394 @@
+"""Run the RuleMark pipeline in one process.
+
+The stages of run_pipeline.sh are declared as a DAG. Machine records are
+read and parsed once by the load stage and shared with every later stage;
+stages whose dependencies are done run concurrently (validate and lint).
+Each stage's output is buffered and printed under its title in pipeline
+order, so the log reads the same as the shell version.
+
+Like make, a stage is skipped when the digest of its inputs (records,
+schema, keys, the tool and every tools module it imports) matches its last
+successful run and its outputs are still on disk unchanged. --force runs
+every stage; --dry-run lists the stages that would run.
+"""
+
+import argparse
+import ast
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import clerk_generate_manifest
+import freeze
+import rulemark_lint
+import sign_manifest
+import validate_canonical
+import verify_manifest
+
+TOOLS_DIR = Path(__file__).resolve().parent
+MACHINE_DIR = "machine"
+STATE_PATH = ".rulemark-pipeline.json"
+
+
+class StageFailed(Exception):
+    pass
+
+
+class Stage:
+    """A pipeline step.
+
+    inputs(results) yields (label, bytes) pairs the stage depends on; a stage
+    without inputs always runs and must be free of side effects. outputs are
+    the files it writes, and restore(results) rebuilds its result from them
+    when the stage is skipped.
+    """
+
+    def __init__(self, name, title, run, after=(), inputs=None, outputs=(), restore=None):
+        self.name = name
+        self.title = title
+        self.run = run
+        self.after = tuple(after)
+        self.inputs = inputs
+        self.outputs = tuple(outputs)
+        self.restore = restore
+
+
+def file_digest(path):
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def imported(data):
+    """Names of the top-level modules a source file imports."""
+    for node in ast.walk(ast.parse(data)):
+        if isinstance(node, ast.Import):
+            yield from (alias.name.partition(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module.partition(".")[0]
+
+
+def sources(module):
+    """(name, source) of module and of every tools module it imports, directly or not."""
+    found = {}
+    pending = [module.__name__]
+    while pending:
+        name = pending.pop()
+        path = TOOLS_DIR / f"{name}.py"
+        if name in found or not path.exists():
+            continue
+        found[name] = path.read_bytes()
+        pending.extend(imported(found[name]))
+    return sorted(found.items())
+
+
+def stage_key(stage, results):
+    if stage.inputs is None:
+        return None
+    h = hashlib.sha256()
+    for label, data in [(__name__, Path(__file__).read_bytes()), *stage.inputs(results)]:
+        for part in (label.encode("utf-8"), data):
+            h.update(len(part).to_bytes(8, "big"))
+            h.update(part)
+    return h.hexdigest()
+
+
+class StageState:
+    """Input keys and output digests of each stage's last successful run."""
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.stages = json.load(f).get("stages", {})
+        except (FileNotFoundError, ValueError):
+            self.stages = {}
+
+    def fresh(self, stage, key):
+        entry = self.stages.get(stage.name)
+        if key is None or entry is None or entry.get("key") != key:
+            return False
+        return all(file_digest(path) == entry["outputs"].get(path) for path in stage.outputs)
+
+    def record(self, stage, key):
+        if key is not None:
+            self.stages[stage.name] = {"key": key, "outputs": {path: file_digest(path) for path in stage.outputs}}
+
+    def save(self):
+        temp = f"{self.path}.tmp"
+        with open(temp, "w") as f:
+            json.dump({"stages": self.stages}, f, indent=2, sort_keys=True)
+        os.replace(temp, self.path)
+
+
+def read_record(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    try:
+        return path, raw, json.loads(raw)
+    except ValueError as e:
+        raise StageFailed(f"[FATAL] {path} is not valid JSON: {e}")
+
+
+def load(results, log):
+    # machine/*.json feeds validate, lint and the manifest (glob order, as the
+    # standalone tools see it); freeze walks the whole machine/ tree.
+    flat = glob.glob(os.path.join(MACHINE_DIR, "*.json"))
+    tree = [str(path) for path in Path(MACHINE_DIR).rglob("*.json")]
+    cache = {path: read_record(path) for path in dict.fromkeys(flat + tree)}
+    return {
+        "machine": [cache[path] for path in flat],
+        "tree": [cache[path] for path in tree],
+    }
+
+
+def validate(results, log):
+    if not validate_canonical.SCHEMA_PATH.exists():
+        raise StageFailed(f"[FATAL] Schema not found: {validate_canonical.SCHEMA_PATH}")
+    schema = validate_canonical.load_json(validate_canonical.SCHEMA_PATH)
+    records = (
+        (path, data)
+        for path, _, data in results["load"]["machine"]
+        if Path(path).name != "canonical_record.schema.json"
+    )
+    errors = validate_canonical.validate_records(records, schema, log)
+    if errors > 0:
+        raise StageFailed(f"\n❌ Validation failed: {errors} file(s) invalid.")
+    log("\n✅ All canonical records are valid.")
+
+
+def lint(results, log):
+    problem = rulemark_lint.lint_records((path, data) for path, _, data in results["load"]["machine"])
+    if problem:
+        raise StageFailed(f"[LINT FAIL] {problem}")
+    log("[LINT PASS]")
+
+
+def manifest(results, log):
+    records = results["load"]["machine"]
+    if not records:
+        records = [read_record(clerk_generate_manifest.create_dummy(log))]
+    items = clerk_generate_manifest.manifest_items(records)
+    return {
+        "bytes": clerk_generate_manifest.write_manifest(clerk_generate_manifest.build_manifest(items), log),
+        "records": records,
+    }
+
+
+def sign(results, log):
+    return sign_manifest.sign(results["manifest"]["bytes"], log)
+
+
+def verify(results, log):
+    if verify_manifest.check(results["manifest"]["bytes"], results["sign"], log) != 0:
+        raise StageFailed("")
+
+
+def freeze_records(results, log):
+    records = {path: data for path, _, data in results["load"]["tree"]}
+    # The manifest stage may have created a dummy record in an empty tree.
+    for path, _, data in results["manifest"]["records"]:
+        records.setdefault(path, data)
+    changed = False
+    for path, data in records.items():
+        changed |= freeze.freeze_file(Path(path), data, log)
+    freeze.commit_frozen(changed, log)
+
+
+def records_input(key):
+    return lambda results: [(path, raw) for path, raw, _ in results["load"][key]]
+
+
+def validate_input(results):
+    yield from sources(validate_canonical)
+    yield str(validate_canonical.SCHEMA_PATH), Path(validate_canonical.SCHEMA_PATH).read_bytes()
+    yield from records_input("machine")(results)
+
+
+def lint_input(results):
+    yield from sources(rulemark_lint)
+    yield from records_input("machine")(results)
+
+
+def manifest_input(results):
+    yield from sources(clerk_generate_manifest)
+    yield from records_input("machine")(results)
+
+
+def manifest_restore(results):
+    with open(clerk_generate_manifest.OUTPUT_FILE, "rb") as f:
+        return {"bytes": f.read(), "records": results["load"]["machine"]}
+
+
+def sign_input(results):
+    yield from sources(sign_manifest)
+    yield "manifest", results["manifest"]["bytes"]
+    key = Path(sign_manifest.KEY_PATH)
+    yield sign_manifest.KEY_PATH, key.read_bytes() if key.exists() else b""
+
+
+def sign_restore(results):
+    with open(sign_manifest.SIG_PATH) as f:
+        return f.read().strip()
+
+
+def verify_input(results):
+    yield from sources(verify_manifest)
+    yield "manifest", results["manifest"]["bytes"]
+    yield "signature", results["sign"].encode("utf-8")
+    yield "SIGNER_PUBLIC_KEY", os.environ.get("SIGNER_PUBLIC_KEY", "").encode("utf-8")
+
+
+def freeze_input(results):
+    yield from sources(freeze)
+    yield from records_input("tree")(results)
+    yield from ((path, raw) for path, raw, _ in results["manifest"]["records"])
+
+
+STAGES = [
+    Stage("load", None, load),
+    Stage("validate", "① Validate canonical records", validate, ["load"], validate_input),
+    Stage("lint", "② Lint RuleMark structure", lint, ["load"], lint_input),
+    Stage(
+        "manifest", "③ Generate batch manifest", manifest, ["validate", "lint"], manifest_input,
+        [clerk_generate_manifest.OUTPUT_FILE], manifest_restore,
+    ),
+    Stage(
+        "sign", "④ Sign manifest", sign, ["manifest"], sign_input,
+        [sign_manifest.SIG_PATH], sign_restore,
+    ),
+    Stage("verify", "⑤ Verify manifest", verify, ["sign"], verify_input),
+    Stage("freeze", "⑥ Freeze records", freeze_records, ["verify"], freeze_input),
+]
+
+
+def run_stage(stage, results):
+    lines = []
+    try:
+        return stage.run(results, lines.append), lines, None
+    except StageFailed as e:
+        if str(e):
+            lines.append(str(e))
+        return None, lines, e
+    except Exception as e:
+        lines.append(f"[FATAL] {stage.name}: {e}")
+        return None, lines, e
+
+
+def ready(pending, results):
+    return [stage for stage in pending if all(d in results for d in stage.after)]
+
+
+def flush(stages, outputs, printed):
+    """Print finished stages from index printed on, in declaration order; return the new index."""
+    # 按声明顺序输出，已完成的阶段才打印
+    while printed < len(stages) and stages[printed].name in outputs:
+        stage = stages[printed]
+        if stage.title:
+            print(stage.title)
+        for line in outputs[stage.name]:
+            print(line)
+        printed += 1
+    return printed
+
+
+def run(stages, jobs, state, force=False):
+    """Run stages as their dependencies finish; return the first failed stage or None."""
+    results, outputs = {}, {}
+    pending = list(stages)
+    running = {}
+    failed = []
+    printed = 0
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        while pending or running:
+            # Skipping a stage can make its dependents ready, so repeat until stable.
+            while not failed and ready(pending, results):
+                for stage in ready(pending, results):
+                    pending.remove(stage)
+                    key = stage_key(stage, results)
+                    if not force and state.fresh(stage, key):
+                        results[stage.name] = stage.restore(results) if stage.restore else None
+                        outputs[stage.name] = ["   [cached] inputs unchanged, skipped"]
+                        continue
+                    running[pool.submit(run_stage, stage, dict(results))] = stage, key
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, key = running.pop(future)
+                value, lines, error = future.result()
+                outputs[stage.name] = lines
+                if error is None:
+                    results[stage.name] = value
+                    state.record(stage, key)
+                else:
+                    failed.append(stage)
+
+            printed = flush(stages, outputs, printed)
+
+    # Stages skipped after the last one that ran have not been printed yet.
+    flush(stages, outputs, printed)
+    state.save()
+    return min(failed, key=stages.index, default=None)
+
+
+def plan(stages, state, force=False):
+    """The stages a run would execute, in order. Only input-free stages are run."""
+    results, execute = {}, []
+    for stage in stages:
+        if stage.inputs is None:
+            value, lines, error = run_stage(stage, results)
+            if error is not None:
+                raise StageFailed("\n".join(lines))
+            results[stage.name] = value
+            execute.append(stage)
+        elif force or not all(d in results for d in stage.after):
+            # An upstream stage would run, so this stage's inputs are not known yet.
+            execute.append(stage)
+        elif state.fresh(stage, stage_key(stage, results)):
+            results[stage.name] = stage.restore(results) if stage.restore else None
+        else:
+            execute.append(stage)
+    return execute
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="stages run at once (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="run every stage, ignoring the stage cache")
+    parser.add_argument("--dry-run", action="store_true", help="list the stages that would run and exit")
+    parser.add_argument("--state", default=STATE_PATH, help="stage cache file (default: %(default)s)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    state = StageState(args.state)
+    if args.dry_run:
+        try:
+            execute = plan(STAGES, state, args.force)
+        except StageFailed as e:
+            print(e)
+            return 1
+        for stage in STAGES:
+            print(f"{'run ' if stage in execute else 'skip'}  {stage.title or stage.name}")
+        return 0
+
+    failed = run(STAGES, max(1, args.jobs), state, args.force)
+    if failed is not None:
+        print(f"✗ RuleMark pipeline stopped at {failed.title or failed.name}")
+        return 1
+    print("✓ RuleMark pipeline completed — FROZEN")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,18 +6,31 @@ def fail(msg):
     print(f"[LINT FAIL] {msg}")
     sys.exit(1)
 
-for path in glob.glob("machine/*.json"):
-    with open(path) as f:
-        data = json.load(f)
+def lint_records(records):
+    """Return the first problem among (path, parsed) machine records, or None."""
+    for path, data in records:
+        if "canonical_id" not in data:
+            return f"{path} missing canonical_id"
+
+        if data.get("status") not in ["DRAFT", "FROZEN"]:
+            return f"{path} invalid status"
+
+        for k, v in data.get("constraints", {}).items():
+            if isinstance(v, str) and len(v) > 80:
+                return f"{path} constraint {k} too verbose"
 
-    if "canonical_id" not in data:
-        fail(f"{path} missing canonical_id")
+    return None
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
 
-    if data.get("status") not in ["DRAFT", "FROZEN"]:
-        fail(f"{path} invalid status")
+def main():
+    problem = lint_records((path, load(path)) for path in glob.glob("machine/*.json"))
+    if problem:
+        fail(problem)
 
-    for k, v in data.get("constraints", {}).items():
-        if isinstance(v, str) and len(v) > 80:
-            fail(f"{path} constraint {k} too verbose")
+    print("[LINT PASS]")
 
-print("[LINT PASS]")
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,73 @@
-import os, sys, nacl.signing, nacl.encoding
+import os, sys, argparse, nacl.signing, nacl.encoding
+
+import jsonl_manifest
 
 KEY_PATH = "private_key.hex"
 MANIFEST_PATH = "registry/manifests/batch_manifest.json"
 SIG_PATH = "registry/manifests/batch_manifest.sig"
 
-def main():
+def load_signing_key():
     # 1. 搞定私钥
     if os.path.exists(KEY_PATH):
         with open(KEY_PATH, "r") as f:
             hex_key = f.read().strip()
-            signing_key = nacl.signing.SigningKey(hex_key, encoder=nacl.encoding.HexEncoder)
-    else:
-        signing_key = nacl.signing.SigningKey.generate()
-        with open(KEY_PATH, "w") as f:
-            f.write(signing_key.encode(encoder=nacl.encoding.HexEncoder).decode('utf-8'))
-    
+            return nacl.signing.SigningKey(hex_key, encoder=nacl.encoding.HexEncoder)
+    signing_key = nacl.signing.SigningKey.generate()
+    with open(KEY_PATH, "w") as f:
+        f.write(signing_key.encode(encoder=nacl.encoding.HexEncoder).decode('utf-8'))
+    return signing_key
+
+def sign(data, log=print, sig_path=SIG_PATH):
+    """Sign manifest bytes, write the .sig file and return the signature hex."""
+    signing_key = load_signing_key()
+
     # 2. 签名
-    with open(MANIFEST_PATH, "rb") as f:
-        data = f.read()
     signed = signing_key.sign(data)
     sig_hex = nacl.encoding.HexEncoder.encode(signed.signature).decode('utf-8')
     
-    with open(SIG_PATH, "w") as f:
+    with open(sig_path, "w") as f:
         f.write(sig_hex)
         
     pub_key = signing_key.verify_key.encode(encoder=nacl.encoding.HexEncoder).decode('utf-8')
-    print(f"   [Signer] Signed successfully.")
-    print(f"   [Signer] PUBLIC KEY: {pub_key}")
+    log(f"   [Signer] Signed successfully.")
+    log(f"   [Signer] PUBLIC KEY: {pub_key}")
     
     # 自动保存公钥给 Verifier 用 (仅用于本次脚本自动演示)
     with open("temp_pub_key.txt", "w") as f:
         f.write(pub_key)
+    return sig_hex
+
+def main():
+    parser = argparse.ArgumentParser(description="Sign the batch manifest.")
+    parser.add_argument("--jsonl", action="store_true", help="sign the streaming manifest's streamed digest")
+    parser.add_argument("--service", metavar="SOCKET", help="with --jsonl, sign through tools/signing_service.py")
+    args = parser.parse_args()
+    if args.service and not args.jsonl:
+        parser.error("--service signs digests, so it needs --jsonl")
+
+    if args.jsonl:
+        # 流式 manifest：签名对象是文件的 SHA-256，而不是整个文件
+        digest = jsonl_manifest.digest(jsonl_manifest.JSONL_PATH)
+        sig_path = jsonl_manifest.JSONL_PATH + ".sig"
+        if not args.service:
+            sign(jsonl_manifest.signed_message(digest), sig_path=sig_path)
+            return
+
+        from signing_service import SignerClient  # signing_service imports this module
+        client = SignerClient(args.service)
+        try:
+            response = client.sign([digest], domain="manifest-jsonl")
+        finally:
+            client.close()
+        with open(sig_path, "w") as f:
+            f.write(response["signatures"][0])
+        print(f"   [Signer] Signed successfully via {args.service}.")
+        print(f"   [Signer] PUBLIC KEY: {response['public_key']}")
+        return
+
+    with open(MANIFEST_PATH, "rb") as f:
+        data = f.read()
+    sign(data)
 
 if __name__ == "__main__":
     main()
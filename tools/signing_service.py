@@ -0,0 +1,197 @@
+"""Long-lived Ed25519 signing service on a Unix socket.
+
+The key is read from private_key.hex once and held in memory. The service
+refuses to start if the key is missing; it never generates one. Clients send
+one JSON request per line and get one JSON response per line:
+
+    {"op": "sign", "domain": "record", "digests": ["<hex sha256>", ...]}
+    {"op": "metrics"}
+    {"op": "public_key"}
+
+Only 32-byte digests are signed, each prefixed with its domain, so the
+service cannot be used to sign arbitrary messages.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+import nacl.encoding
+import nacl.signing
+
+import jsonl_manifest
+import sign_manifest
+
+SOCKET_PATH = ".rulemark-signer.sock"
+MAX_BATCH = 100_000
+DOMAINS = {
+    "manifest-jsonl": jsonl_manifest.SIGNED_PREFIX,
+    "record": b"RULEMARK-RECORD-SHA256\x00",
+}
+
+
+class SignerServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, signing_key):
+        super().__init__(path, SignerHandler)
+        self.signing_key = signing_key
+        self.public_key = signing_key.verify_key.encode(encoder=nacl.encoding.HexEncoder).decode("utf-8")
+        self.started = time.monotonic()
+        self.lock = threading.Lock()
+        self.batches = 0
+        self.signatures = 0
+        self.signing_seconds = 0.0
+
+    def sign(self, domain, digests):
+        if domain not in DOMAINS:
+            raise ValueError(f"unknown domain {domain!r}; expected one of {sorted(DOMAINS)}")
+        if len(digests) > MAX_BATCH:
+            raise ValueError(f"batch of {len(digests)} exceeds {MAX_BATCH} digests")
+        messages = []
+        for digest in digests:
+            data = bytes.fromhex(digest)
+            if len(data) != 32:
+                raise ValueError(f"not a SHA-256 digest: {digest}")
+            messages.append(DOMAINS[domain] + data)
+
+        started = time.perf_counter()
+        signatures = [self.signing_key.sign(m).signature.hex() for m in messages]
+        seconds = time.perf_counter() - started
+        with self.lock:
+            self.batches += 1
+            self.signatures += len(signatures)
+            self.signing_seconds += seconds
+        return {
+            "signatures": signatures,
+            "public_key": self.public_key,
+            "count": len(signatures),
+            "seconds": round(seconds, 6),
+            "per_second": round(len(signatures) / seconds) if seconds else None,
+        }
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "public_key": self.public_key,
+                "uptime": round(time.monotonic() - self.started, 3),
+                "batches": self.batches,
+                "signatures": self.signatures,
+                "signing_seconds": round(self.signing_seconds, 6),
+                "per_second": round(self.signatures / self.signing_seconds) if self.signing_seconds else None,
+            }
+
+
+class SignerHandler(socketserver.StreamRequestHandler):
+    server: SignerServer
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                op = request.get("op")
+                if op == "sign":
+                    response = self.server.sign(request.get("domain"), request.get("digests", []))
+                elif op == "metrics":
+                    response = self.server.metrics()
+                elif op == "public_key":
+                    response = {"public_key": self.server.public_key}
+                else:
+                    response = {"error": f"unknown op {op!r}"}
+            except (ValueError, AttributeError, TypeError) as e:
+                response = {"error": str(e)}
+            self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class SignerClient:
+    """Client for the signing service; one connection, many requests."""
+
+    def __init__(self, path=SOCKET_PATH):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(path)
+        self.file = self.sock.makefile("rwb")
+
+    def request(self, **request):
+        self.file.write((json.dumps(request) + "\n").encode("utf-8"))
+        self.file.flush()
+        line = self.file.readline()
+        if not line:
+            raise RuntimeError("signing service closed the connection")
+        response = json.loads(line)
+        if "error" in response:
+            raise RuntimeError(f"signing service: {response['error']}")
+        return response
+
+    def sign(self, digests, domain="record"):
+        """Sign digests (bytes) in one batch; return the response with hex signatures."""
+        return self.request(op="sign", domain=domain, digests=[d.hex() for d in digests])
+
+    def metrics(self):
+        return self.request(op="metrics")
+
+    def close(self):
+        self.file.close()
+        self.sock.close()
+
+
+def load_key(path):
+    """The signing key at path, or None. Unlike sign_manifest, never generates one."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return nacl.signing.SigningKey(f.read().strip(), encoder=nacl.encoding.HexEncoder)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--key", default=sign_manifest.KEY_PATH, help="hex Ed25519 private key (default: %(default)s)")
+    parser.add_argument("--socket", default=SOCKET_PATH, help="Unix socket to listen on (default: %(default)s)")
+    args = parser.parse_args()
+
+    try:
+        signing_key = load_key(args.key)
+    except (ValueError, TypeError) as e:
+        print(f"❌ FATAL: {args.key} is not a valid Ed25519 key: {e}")
+        return 1
+    if signing_key is None:
+        print(f"❌ FATAL: Signing key {args.key} not found. Refusing to start with a new key.")
+        return 1
+
+    if os.path.exists(args.socket):
+        try:
+            SignerClient(args.socket).close()
+        except OSError:
+            os.unlink(args.socket)  # 上次异常退出留下的 socket
+        else:
+            print(f"❌ FATAL: A signing service is already listening on {args.socket}")
+            return 1
+
+    old_umask = os.umask(0o177)  # socket 只允许本用户访问
+    try:
+        server = SignerServer(args.socket, signing_key)
+    finally:
+        os.umask(old_umask)
+    print(f"   [Signer] Listening on {args.socket}, PUBLIC KEY: {server.public_key}")
+    # SIGTERM 也走 finally，清理 socket 文件
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+        metrics = server.metrics()
+        print(f"   [Signer] Signed {metrics['signatures']} digest(s) in {metrics['batches']} batch(es)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
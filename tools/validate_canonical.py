@@ -13,28 +13,39 @@ def load_json(path):
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
-def main():
-    if not SCHEMA_PATH.exists():
-        print(f"[FATAL] Schema not found: {SCHEMA_PATH}")
-        sys.exit(1)
-
-    schema = load_json(SCHEMA_PATH)
-
+def validate_records(records, schema, log=print):
+    """Validate (path, parsed) machine records; return the number of invalid ones."""
     errors = 0
 
-    for json_file in MACHINE_DIR.glob("*.json"):
+    for json_file, data in records:
+        json_file = Path(json_file)
         if json_file.name == "canonical_record.schema.json":
             continue
 
         try:
-            data = load_json(json_file)
             validate(instance=data, schema=schema)
-            print(f"[PASS] {json_file.name}")
+            log(f"[PASS] {json_file.name}")
         except jsonschema.exceptions.ValidationError as e:
-            print(f"[FAIL] {json_file.name}")
-            print(f"       → {e.message}")
+            log(f"[FAIL] {json_file.name}")
+            log(f"       → {e.message}")
             errors += 1
 
+    return errors
+
+def main():
+    if not SCHEMA_PATH.exists():
+        print(f"[FATAL] Schema not found: {SCHEMA_PATH}")
+        sys.exit(1)
+
+    schema = load_json(SCHEMA_PATH)
+
+    records = (
+        (json_file, load_json(json_file))
+        for json_file in MACHINE_DIR.glob("*.json")
+        if json_file.name != "canonical_record.schema.json"
+    )
+    errors = validate_records(records, schema)
+
     if errors > 0:
         print(f"\n❌ Validation failed: {errors} file(s) invalid.")
         sys.exit(1)
@@ -1,61 +1,282 @@
+import argparse
+import datetime
+import functools
+import glob
+import json
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
+import nacl.exceptions
 import nacl.signing
 import nacl.encoding
-def main():
-    print("--- [Verifier] CI/CD Sovereignty Check ---")
+
+import jsonl_manifest
+import merkle
+from clerk_generate_manifest import MANIFEST_TYPE, manifest_items
+
+def check(manifest_bytes=None, sig_hex=None, log=print):
+    log("--- [Verifier] CI/CD Sovereignty Check ---")
 
     # 1. 获取公钥 (带清洗功能)
     raw_key = os.environ.get("SIGNER_PUBLIC_KEY")
 
     if not raw_key:
-        print("❌ FATAL: Environment variable 'SIGNER_PUBLIC_KEY' is EMPTY.")
-        print("   -> Check GitHub Repo Settings -> Secrets.")
-        sys.exit(1)
+        log("❌ FATAL: Environment variable 'SIGNER_PUBLIC_KEY' is EMPTY.")
+        log("   -> Check GitHub Repo Settings -> Secrets.")
+        return 1
     
     # 关键修复：强行去除首尾空格和换行符
     pub_key_hex = raw_key.strip()
     
     # 调试信息 (只会打印长度，不会泄露密钥)
-    print(f"ℹ️  Key loaded. Raw length: {len(raw_key)}, Stripped length: {len(pub_key_hex)}")
+    log(f"ℹ️  Key loaded. Raw length: {len(raw_key)}, Stripped length: {len(pub_key_hex)}")
 
     if len(pub_key_hex) != 64:
-        print(f"❌ FATAL: Invalid Key Length! Expected 64 hex chars, got {len(pub_key_hex)}.")
-        print("   -> Your secret might be cut off or have hidden characters.")
-        sys.exit(1)
+        log(f"❌ FATAL: Invalid Key Length! Expected 64 hex chars, got {len(pub_key_hex)}.")
+        log("   -> Your secret might be cut off or have hidden characters.")
+        return 1
 
-    # 2. 检查文件是否存在
+    # 2. 检查文件是否存在 (pipeline 直接传入内存中的 manifest 和签名)
     manifest_path = "registry/manifests/batch_manifest.json"
     sig_path = "registry/manifests/batch_manifest.sig"
 
-    if not os.path.exists(manifest_path) or not os.path.exists(sig_path):
-        print(f"❌ FATAL: Files missing. Looking for:")
-        print(f"   - {manifest_path}")
-        print(f"   - {sig_path}")
-        sys.exit(1)
+    if manifest_bytes is None and (not os.path.exists(manifest_path) or not os.path.exists(sig_path)):
+        log(f"❌ FATAL: Files missing. Looking for:")
+        log(f"   - {manifest_path}")
+        log(f"   - {sig_path}")
+        return 1
 
     # 3. 执行验签
     try:
-        with open(manifest_path, "rb") as f:
-            manifest_bytes = f.read()
+        if manifest_bytes is None:
+            with open(manifest_path, "rb") as f:
+                manifest_bytes = f.read()
         
-        with open(sig_path, "r") as f:
-            # 同样对签名文件做清洗
-            sig_hex = f.read().strip()
+            with open(sig_path, "r") as f:
+                # 同样对签名文件做清洗
+                sig_hex = f.read().strip()
 
         verify_key = nacl.signing.VerifyKey(pub_key_hex, encoder=nacl.encoding.HexEncoder)
         verify_key.verify(manifest_bytes, nacl.encoding.HexEncoder.decode(sig_hex))
         
-        print("✅ SUCCESS: Signature MATCHES. Sovereignty verified.")
-        sys.exit(0)
+        log("✅ SUCCESS: Signature MATCHES. Sovereignty verified.")
+        return 0
 
     except nacl.exceptions.BadSignatureError:
-        print("❌ FAILURE: Signature REJECTED (Crypto mismatch).")
-        print("   -> This means the file content was changed OR the wrong key was used.")
-        sys.exit(1)
+        log("❌ FAILURE: Signature REJECTED (Crypto mismatch).")
+        log("   -> This means the file content was changed OR the wrong key was used.")
+        return 1
     except Exception as e:
-        print(f"❌ ERROR: System crash: {str(e)}")
-        sys.exit(1)
+        log(f"❌ ERROR: System crash: {str(e)}")
+        return 1
+
+def check_items(paths, manifest_bytes=None, sig_hex=None, log=print):
+    """Verify the manifest signature, then each record's inclusion proof against its root."""
+    if manifest_bytes is None:
+        with open("registry/manifests/batch_manifest.json", "rb") as f:
+            manifest_bytes = f.read()
+        with open("registry/manifests/batch_manifest.sig", "r") as f:
+            sig_hex = f.read().strip()
+    code = check(manifest_bytes, sig_hex, log)
+    if code != 0:
+        return code
+
+    manifest = json.loads(manifest_bytes)
+    target = manifest.get("consensus_target", {})
+    if target.get("tree") != merkle.TREE:
+        log(f"❌ FATAL: Manifest has no {merkle.TREE} Merkle tree; regenerate it.")
+        return 1
+    entries = {entry["canonical_id"]: entry for entry in manifest.get("items", [])}
+
+    failures = 0
+    for path in paths:
+        with open(path, "rb") as f:
+            raw = f.read()
+        items = manifest_items([(path, raw, json.loads(raw))])
+        entry = entries.get(items[0]["canonical_id"]) if items else None
+        # proof 只来自 manifest，item 字段从记录文件重新计算
+        if entry is None or not merkle.verify_item(dict(items[0], proof=entry["proof"]), target["size"], target["merkle_root"]):
+            log(f"[PROOF FAIL] {path} is not in the signed batch")
+            failures += 1
+        else:
+            log(f"[PROOF OK] {path} (leaf {entry['proof']['index']} of {target['size']})")
+    return 1 if failures else 0
+
+def check_jsonl(path=jsonl_manifest.JSONL_PATH, log=print):
+    """Verify a streaming manifest in constant memory: its trailer, then its signature."""
+    sig_path = path + ".sig"
+    if not os.path.exists(path) or not os.path.exists(sig_path):
+        log("❌ FATAL: Files missing. Looking for:")
+        log(f"   - {path}")
+        log(f"   - {sig_path}")
+        return 1
+    try:
+        digest = jsonl_manifest.check(path)
+    except ValueError as e:
+        log(f"❌ FAILURE: {path}: {e}")
+        return 1
+    with open(sig_path, "r") as f:
+        sig_hex = f.read().strip()
+    return check(jsonl_manifest.signed_message(digest), sig_hex, log)
+
+MANIFEST_DIR = "registry/manifests"
+
+def timestamp(value, end_of_day=False):
+    if value is None:
+        return None
+    # 纯日期按当天 00:00 UTC 处理；作为 not_after 时包含当天全天
+    if end_of_day:
+        try:
+            day = datetime.date.fromisoformat(value)
+        except ValueError:
+            pass
+        else:
+            return datetime.datetime.combine(day, datetime.time.max, datetime.timezone.utc)
+    parsed = datetime.datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+
+def load_keyring(path=None):
+    """Public keys by key ID from a keyring file, or SIGNER_PUBLIC_KEY as key "env"."""
+    if path is None:
+        raw_key = os.environ.get("SIGNER_PUBLIC_KEY", "").strip()
+        if not raw_key:
+            raise ValueError("no --keyring given and SIGNER_PUBLIC_KEY is EMPTY")
+        return {"env": {"public_key": raw_key, "not_before": None, "not_after": None}}
+    with open(path) as f:
+        entries = json.load(f)["keys"]
+    keyring = {}
+    for entry in entries:
+        keyring[entry["key_id"]] = {
+            "public_key": entry["public_key"].strip(),
+            "not_before": timestamp(entry.get("not_before")),
+            "not_after": timestamp(entry.get("not_after"), end_of_day=True),
+        }
+    return keyring
+
+@functools.lru_cache(maxsize=None)
+def verify_key(pub_key_hex):
+    # 每个公钥只解析一次，所有线程共用
+    return nacl.signing.VerifyKey(pub_key_hex, encoder=nacl.encoding.HexEncoder)
+
+def discover(directory=MANIFEST_DIR):
+    """Candidate (manifest, signature) pairs: X.json with X.sig, X.jsonl with X.jsonl.sig.
+
+    Whether a candidate is a batch manifest at all is decided by verify_pair.
+    """
+    pairs = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.json")) + glob.glob(os.path.join(directory, "*.jsonl"))):
+        sig_path = path + ".sig" if path.endswith(".jsonl") else path[:-len(".json")] + ".sig"
+        pairs.append((path, sig_path))
+    return pairs
+
+def verify_pair(manifest_path, sig_path, keyring):
+    """Return a result row: manifest, key, issued, result (OK, FAIL or SKIP), detail."""
+    row = {"manifest": os.path.basename(manifest_path), "key": "-", "issued": "-"}
+    try:
+        if manifest_path.endswith(".jsonl"):
+            meta = jsonl_manifest.header(manifest_path)
+        else:
+            with open(manifest_path, "rb") as f:
+                message = f.read()
+            document = json.loads(message)
+            # registry/manifests 里可能还有别的 JSON，只校验 batch manifest
+            meta = document.get("meta") if isinstance(document, dict) else None
+            if not isinstance(meta, dict) or meta.get("type") != MANIFEST_TYPE:
+                return dict(row, result="SKIP", detail="not a batch manifest")
+    except (ValueError, OSError) as e:
+        return dict(row, result="FAIL", detail=str(e))
+
+    if not os.path.exists(sig_path):
+        return dict(row, result="FAIL", detail=f"missing {os.path.basename(sig_path)}")
+    try:
+        if manifest_path.endswith(".jsonl"):
+            message = jsonl_manifest.signed_message(jsonl_manifest.check(manifest_path))
+        with open(sig_path, "r") as f:
+            signature = nacl.encoding.HexEncoder.decode(f.read().strip())
+        issued = timestamp(meta.get("issued_at"))
+    except (ValueError, TypeError, OSError) as e:
+        return dict(row, result="FAIL", detail=str(e))
+    if issued is not None:
+        row["issued"] = issued.date().isoformat()
+
+    key_id = meta.get("key_id")
+    if key_id is not None and not isinstance(key_id, str):
+        return dict(row, result="FAIL", detail="key_id is not a string")
+    if key_id is not None and key_id not in keyring:
+        return dict(row, key=key_id, result="FAIL", detail="unknown key ID")
+    candidates = [key_id] if key_id is not None else sorted(keyring)
+
+    for candidate in candidates:
+        key = keyring[candidate]
+        try:
+            verify_key(key["public_key"]).verify(message, signature)
+        except (nacl.exceptions.BadSignatureError, ValueError, TypeError):
+            continue
+        row["key"] = candidate
+        if issued is None:
+            if key["not_before"] or key["not_after"]:
+                return dict(row, result="FAIL", detail="undated manifest; key has a validity period")
+        elif (key["not_before"] and issued < key["not_before"]) or (key["not_after"] and issued > key["not_after"]):
+            return dict(row, result="FAIL", detail="signed outside the key's validity period")
+        return dict(row, result="OK", detail="")
+    return dict(row, key=key_id or "-", result="FAIL", detail="signature REJECTED")
+
+def check_all(directory=MANIFEST_DIR, keyring_path=None, jobs=None, log=print):
+    """Verify every manifest/signature pair in directory; print a table and return an exit code."""
+    log(f"--- [Verifier] Bulk check of {directory} ---")
+    try:
+        keyring = load_keyring(keyring_path)
+    except (ValueError, KeyError, OSError) as e:
+        log(f"❌ FATAL: Cannot load keys: {e}")
+        return 1
+    pairs = discover(directory)
+    if not pairs:
+        log(f"❌ FATAL: No manifests found in {directory}")
+        return 1
+
+    def verify_row(pair):
+        # 单个 manifest 出错只影响它自己那一行，不中断整个表
+        try:
+            return verify_pair(*pair, keyring)
+        except Exception as e:
+            return {"manifest": os.path.basename(pair[0]), "key": "-", "issued": "-", "result": "FAIL", "detail": repr(e)}
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        rows = list(pool.map(verify_row, pairs))
+
+    columns = ("manifest", "key", "issued", "result", "detail")
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    log("  ".join(c.upper().ljust(widths[c]) for c in columns).rstrip())
+    for r in rows:
+        log("  ".join(str(r[c]).ljust(widths[c]) for c in columns).rstrip())
+
+    manifests = [r for r in rows if r["result"] != "SKIP"]
+    failures = sum(r["result"] == "FAIL" for r in manifests)
+    if not manifests:
+        log(f"❌ FATAL: No batch manifests found in {directory}")
+        return 1
+    if failures:
+        log(f"❌ FAILURE: {failures} of {len(manifests)} manifest(s) failed verification.")
+        return 1
+    log(f"✅ SUCCESS: All {len(manifests)} manifest(s) verified.")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify the signed batch manifest.")
+    parser.add_argument("records", nargs="*", help="machine records to prove against the signed Merkle root")
+    parser.add_argument("--jsonl", action="store_true", help="verify the streaming manifest instead")
+    parser.add_argument("--all", action="store_true", help="verify every manifest/signature pair in --dir")
+    parser.add_argument("--dir", default=MANIFEST_DIR, help="with --all, where to look (default: %(default)s)")
+    parser.add_argument("--keyring", help="with --all, JSON keyring of key IDs, public keys and validity periods")
+    parser.add_argument("--jobs", type=int, help="with --all, manifests verified at once")
+    args = parser.parse_args()
+    if args.all:
+        sys.exit(check_all(args.dir, args.keyring, args.jobs))
+    if args.jsonl:
+        sys.exit(check_jsonl())
+    if args.records:
+        sys.exit(check_items(args.records))
+    sys.exit(check())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file